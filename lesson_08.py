@@ -1,39 +1,40 @@
 # using context manager to read a file
 
-with open('greetings.txt', 'r') as file:
-    # read the entire file content into one string
-    content = file.read()
-    print("--- Reading entire file: ---")
-    print(content)
+if __name__ == '__main__':
+    with open('greetings.txt', 'r') as file:
+        # read the entire file content into one string
+        content = file.read()
+        print("--- Reading entire file: ---")
+        print(content)
 
-# The file is automatically closed here
+    # The file is automatically closed here
 
-# A more memory-efficient way for large files is to iterate line by line
-print("\n--- Reading file line by line: ---")
-with open('greetings.txt', 'r') as file:
-    for line in file:
-        # .strip() removes leading/trailing whitespace, includig the newline character
-        print(line.strip())
+    # A more memory-efficient way for large files is to iterate line by line
+    print("\n--- Reading file line by line: ---")
+    with open('greetings.txt', 'r') as file:
+        for line in file:
+            # .strip() removes leading/trailing whitespace, includig the newline character
+            print(line.strip())
 
 
-# using 'w' mode will create 'app.log' and write to it.
-# if 'app.log' already exists, it will be completely overwritten.
+    # using 'w' mode will create 'app.log' and write to it.
+    # if 'app.log' already exists, it will be completely overwritten.
 
-with open('app.log', 'w') as file:
-    file.write("Application started.\n")
-    file.write("Processing data...\n")
+    with open('app.log', 'w') as file:
+        file.write("Application started.\n")
+        file.write("Processing data...\n")
 
-# using 'a' mode to append to the same file without erasing it
+    # using 'a' mode to append to the same file without erasing it
 
-with open('app.log', 'a') as file:
-    file.write("Data processing complete. \n")
-    file.write("Application shutting down. \n")
+    with open('app.log', 'a') as file:
+        file.write("Data processing complete. \n")
+        file.write("Application shutting down. \n")
 
 
-# let's verify the content
-print("\n--- Content of app.log: ---")
-with open('app.log', 'r') as file:
-    print(file.read())
+    # let's verify the content
+    print("\n--- Content of app.log: ---")
+    with open('app.log', 'r') as file:
+        print(file.read())
 
 
 # try - except method on files
@@ -59,12 +60,489 @@ def safe_read(filepath):
 # --- Testing our safe_read function ---
 
 # 1. Test with a file that exists
-print("\n--- Testing safe_read with existing file: ---")
-content = safe_read('greetings.txt')
-print(content)
+if __name__ == '__main__':
+    print("\n--- Testing safe_read with existing file: ---")
+    content = safe_read('greetings.txt')
+    print(content)
+
+    # 2: Test with a file that does not exist
+
+    print("\n--- Testing safe_read with non-existing file: ---")
+    content = safe_read('ghost_file.txt')
+    print(content)
+
+# reading big files without loading them whole
+
+import mmap
+import os
+import time
+
+
+def safe_read_range(filepath, start=0, end=None, mode="chunks", chunk_size=1024 * 1024):
+    """
+    Reads part or all of a file without copying all of it into memory.
+    Handles the same errors as safe_read and returns the same error strings.
+
+    mode="chunks": a generator of bytes objects of at most chunk_size bytes
+    mode="lines":  a generator of decoded lines (newline kept, like iterating a file)
+    mode="mmap":   a zero-copy memoryview of the bytes, backed by a memory map
+    :param filepath:
+    :param start: first byte to read
+    :param end: byte to stop before (None for end of file)
+    :return:
+    """
+    if mode not in ("chunks", "lines", "mmap"):
+        raise ValueError(f"Unknown mode {mode!r}, expected 'chunks', 'lines' or 'mmap'.")
+    if start < 0 or (end is not None and end < start):
+        raise ValueError("Byte range must satisfy 0 <= start <= end.")
+    try:
+        file = open(filepath, 'rb')
+    except FileNotFoundError:
+        return f"Error: The file '{filepath}' was not found."
+    except PermissionError:
+        return f"Error: You don't have permission to read '{filepath}'."
+    except Exception as e:
+        return f"An unexpected error occurred: {e}"
+
+    if mode == "mmap":
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            end = size if end is None else min(end, size)
+            if start >= end:
+                return memoryview(b"")
+            # The memoryview keeps the map alive after the file is closed
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(mapped)[start:end]
+    if mode == "lines":
+        return _read_lines(file, start, end)
+    return _read_chunks(file, start, end, chunk_size)
+
+
+def _read_chunks(file, start, end, chunk_size):
+    with file:
+        file.seek(start)
+        remaining = None if end is None else end - start
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = file.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def _read_lines(file, start, end):
+    # A byte range can cut a multi-byte character in two where it starts or
+    # ends; those cut pieces decode to U+FFFD instead of raising
+    with file:
+        file.seek(start)
+        position = start
+        for line in file:
+            errors = 'replace' if position == start != 0 else 'strict'
+            if end is not None and position + len(line) > end:
+                # Last, partial line of the range
+                if position < end:
+                    yield line[:end - position].decode(errors='replace')
+                break
+            position += len(line)
+            yield line.decode(errors=errors)
+
+
+def _peak_rss_of(task):
+    """Run task() in a forked child and return (seconds to first byte, total seconds, peak RSS bytes)."""
+    import multiprocessing
+    import resource
+
+    def child(conn):
+        # Reset the high-water mark inherited from the parent (Linux only)
+        try:
+            with open('/proc/self/clear_refs', 'w') as refs:
+                refs.write('5')
+            reset = True
+        except OSError:
+            reset = False
+        started = time.perf_counter()
+        first_byte = task()
+        total = time.perf_counter() - started
+        peak = None
+        if reset:
+            with open('/proc/self/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        peak = int(line.split()[1]) * 1024
+        if peak is None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        conn.send((first_byte - started, total, peak))
+        conn.close()
+
+    context = multiprocessing.get_context('fork')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=child, args=(child_conn,))
+    process.start()
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+def benchmark_readers(filepath, chunk_size=1024 * 1024):
+    """Compare safe_read with chunked and memory-mapped reads of the same file."""
+
+    def whole_file():
+        content = safe_read(filepath)
+        first_byte = time.perf_counter()
+        len(content)
+        return first_byte
+
+    def chunked():
+        first_byte = None
+        for chunk in safe_read_range(filepath, mode="chunks", chunk_size=chunk_size):
+            if first_byte is None:
+                first_byte = time.perf_counter()
+        return first_byte
+
+    def mapped():
+        view = safe_read_range(filepath, mode="mmap")
+        first_byte = time.perf_counter()
+        view[0]
+        # Touch one byte per chunk, the way a random-access reader would
+        for offset in range(0, len(view), chunk_size):
+            view[offset]
+        return first_byte
+
+    size = os.path.getsize(filepath)
+    print(f"Reading {size / 1e6:.1f} MB:")
+    for name, task in (("safe_read", whole_file), ("chunks", chunked), ("mmap", mapped)):
+        to_first_byte, total, peak = _peak_rss_of(task)
+        print(f"  {name:<9} first byte {to_first_byte * 1000:8.2f} ms, "
+              f"total {total * 1000:8.2f} ms, peak RSS {peak / 1e6:7.1f} MB")
+
+
+if __name__ == '__main__':
+    print("\n--- Reading a byte range of greetings.txt: ---")
+    for chunk in safe_read_range('greetings.txt', start=7, end=30, chunk_size=8):
+        print(chunk)
+    print(bytes(safe_read_range('greetings.txt', end=14, mode="mmap")))
+    print(safe_read_range('ghost_file.txt', mode="lines"))
+
+    print("\n--- Benchmark against safe_read: ---")
+    import tempfile
+
+    with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as big_file:
+        line = "2024-01-01 12:00:00 INFO Processing data...\n"
+        big_file.write(line * (50_000_000 // len(line)))
+    try:
+        benchmark_readers(big_file.name)
+    finally:
+        os.remove(big_file.name)
+
+
+# a long-lived log writer instead of reopening app.log for every few lines
+
+import threading
+
+
+class LogWriter:
+    """
+    Keeps a log file open and writes records in batches.
+
+    Records are buffered and written with one system call once buffer_size
+    bytes are waiting or flush_interval seconds have passed. With
+    background=True the writes happen on a separate thread. When the file
+    would grow past max_bytes it is rotated: app.log -> app.log.1 -> app.log.2 ...
+    keeping backup_count old generations.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=3,
+                 buffer_size=64 * 1024, flush_interval=1.0, background=False, encoding='utf-8'):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.encoding = encoding
+        self.rotations = 0
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._open()
+
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._flush_loop, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _open(self):
+        # Unbuffered: we do our own batching, so each flush is exactly one write()
+        self._file = open(self.path, 'ab', buffering=0)
+        self._size = os.fstat(self._file.fileno()).st_size
+
+    def write(self, line):
+        """Queue one log line; a newline is added if it is missing."""
+        if not line.endswith('\n'):
+            line += '\n'
+        data = line.encode(self.encoding)
+        with self._lock:
+            if self._closed:
+                raise ValueError("I/O operation on closed LogWriter.")
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            due = (self._buffered_bytes >= self.buffer_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due and self._thread is not None:
+                self._wake.notify()
+        if due and self._thread is None:
+            self.flush()
+
+    def flush(self):
+        """Write out everything buffered so far."""
+        # Hold _io_lock from taking the batch until it is written, so two
+        # concurrent flushes can't write their batches in the wrong order.
+        # write() only needs _lock, so it is never held up by the disk.
+        with self._io_lock:
+            with self._lock:
+                batch = b''.join(self._buffer)
+                self._buffer.clear()
+                self._buffered_bytes = 0
+                self._last_flush = time.monotonic()
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        if self.max_bytes and self._size and self._size + len(batch) > self.max_bytes:
+            self._rotate()
+        self._file.write(batch)
+        self._size += len(batch)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for generation in range(self.backup_count - 1, 0, -1):
+                older = f"{self.path}.{generation}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{generation + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, 'ab', buffering=0)
+        else:
+            self._file = open(self.path, 'wb', buffering=0)
+        self._size = 0
+        self.rotations += 1
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                if not self._closed and self._buffered_bytes < self.buffer_size:
+                    self._wake.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self):
+        """Flush whatever is left and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def benchmark_log_writer(directory, lines=100_000):
+    """Lines per second: reopening the file per append vs a LogWriter."""
+    line = "Processing data...\n"
+
+    path = os.path.join(directory, 'open_per_append.log')
+    start = time.perf_counter()
+    for _ in range(lines):
+        with open(path, 'a') as file:
+            file.write(line)
+    per_append = time.perf_counter() - start
+
+    results = {"open per append": per_append}
+    for background in (False, True):
+        path = os.path.join(directory, f'log_writer_{background}.log')
+        start = time.perf_counter()
+        with LogWriter(path, max_bytes=0, background=background) as log:
+            for _ in range(lines):
+                log.write(line)
+        results[f"LogWriter (background={background})"] = time.perf_counter() - start
+
+    for name, elapsed in results.items():
+        print(f"  {name:<28} {lines / elapsed:>12,.0f} lines/sec")
+    return results
+
+
+if __name__ == '__main__':
+    print("\n--- Writing app.log with a LogWriter: ---")
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_path = os.path.join(log_dir, 'app.log')
+        with LogWriter(log_path, max_bytes=60, backup_count=2, buffer_size=32) as log:
+            log.write("Application started.")
+            log.write("Processing data...")
+            log.write("Data processing complete.")
+            log.write("Application shutting down.")
+        print(sorted(os.listdir(log_dir)))
+        with open(log_path, 'r') as file:
+            print(file.read())
+
+        print("--- Benchmark against open-per-append: ---")
+        benchmark_log_writer(log_dir, lines=20_000)
+
+
+# random access to lines: a sidecar index of where every line starts
+
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+
+class LineIndex:
+    """
+    Finds line n of a text file with one seek instead of reading every line before it.
+
+    The start offset of every line is kept in a sidecar file (app.log.idx for
+    app.log). Each lookup stats the file: if it only grew, just the appended
+    part is scanned and added to the index; if it was rewritten, the index is rebuilt.
+    """
+    MAGIC = b'LINEIDX1'
+    HEADER = struct.Struct('<8sQQ')  # magic, indexed file size, file mtime in ns
+
+    def __init__(self, path, index_path=None, encoding='utf-8', auto_refresh=True):
+        self.path = path
+        self.index_path = index_path or path + '.idx'
+        self.encoding = encoding
+        self.auto_refresh = auto_refresh
+        # offsets[i] is where line i starts; the last entry is the indexed file size
+        self._offsets = array('Q', [0])
+        self._mtime_ns = 0
+        self._load()
+        self.refresh()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'rb') as file:
+                magic, size, mtime_ns = self.HEADER.unpack(file.read(self.HEADER.size))
+                offsets = array('Q')
+                offsets.frombytes(file.read())
+        except (OSError, struct.error, ValueError):
+            return  # missing or damaged index: refresh() rebuilds it
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        if magic == self.MAGIC and offsets and offsets[-1] == size:
+            self._offsets = offsets
+            self._mtime_ns = mtime_ns
+
+    def _save(self, first_changed=0):
+        # Rewrite the header and only the offsets from first_changed onwards
+        offsets = self._offsets[first_changed:]
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        mode = 'r+b' if first_changed and os.path.exists(self.index_path) else 'wb'
+        with open(self.index_path, mode) as file:
+            file.write(self.HEADER.pack(self.MAGIC, self._offsets[-1], self._mtime_ns))
+            file.seek(self.HEADER.size + first_changed * offsets.itemsize)
+            file.write(offsets.tobytes())
+            file.truncate()
+
+    def refresh(self):
+        """Bring the index up to date with the file; cheap (one stat) when nothing changed."""
+        stat = os.stat(self.path)
+        indexed_size = self._offsets[-1]
+        if stat.st_size == indexed_size and stat.st_mtime_ns == self._mtime_ns:
+            return
+        with open(self.path, 'rb') as file:
+            if stat.st_size > indexed_size and indexed_size > 0:
+                file.seek(indexed_size - 1)
+                ended_with_newline = file.read(1) == b'\n'
+                first_changed = len(self._offsets) - 1
+                if not ended_with_newline:
+                    # The old last line continues into the appended data
+                    self._offsets.pop()
+                    first_changed -= 1
+                start = indexed_size
+            else:
+                self._offsets = array('Q', [0])
+                first_changed = 0
+                start = 0
+            file.seek(start)
+            # map(len, file) and accumulate both run in C: no Python loop per line
+            ends = accumulate(map(len, file), initial=start)
+            next(ends)
+            self._offsets.extend(ends)
+        self._mtime_ns = stat.st_mtime_ns
+        self._save(first_changed)
+
+    def __len__(self):
+        if self.auto_refresh:
+            self.refresh()
+        return len(self._offsets) - 1
+
+    def _read(self, first, last):
+        # Decoded lines first..last-1, read with a single seek and read
+        offsets = self._offsets
+        with open(self.path, 'rb') as file:
+            file.seek(offsets[first])
+            data = file.read(offsets[last] - offsets[first])
+        lines = []
+        for i in range(first, last):
+            line = data[offsets[i] - offsets[first]:offsets[i + 1] - offsets[first]]
+            lines.append(line.decode(self.encoding).rstrip('\r\n'))
+        return lines
+
+    def get_line(self, n):
+        """Line n (0-based, negative counts from the end), without its newline."""
+        count = len(self)
+        if n < 0:
+            n += count
+        if not 0 <= n < count:
+            raise IndexError(f"line {n} out of range for '{self.path}' ({count} lines)")
+        return self._read(n, n + 1)[0]
+
+    def lines(self, start, stop=None):
+        """Lines start..stop-1, like slicing a list of the file's lines."""
+        first, last, _ = slice(start, stop).indices(len(self))
+        return self._read(first, last) if first < last else []
+
+    def tail(self, n=10):
+        """The last n lines."""
+        count = len(self)
+        return self._read(max(0, count - n), count) if n > 0 else []
+
 
-# 2: Test with a file that does not exist
+if __name__ == '__main__':
+    print("\n--- Random access to lines of greetings.txt: ---")
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = LineIndex('greetings.txt', index_path=os.path.join(index_dir, 'greetings.txt.idx'))
+        print(f"{len(index)} lines; line 1: {index.get_line(1)!r}")
+        print(index.tail(2))
 
-print("\n--- Testing safe_read with non-existing file: ---")
-content = safe_read('ghost_file.txt')
-print(content)
\ No newline at end of file
+        big_log = os.path.join(index_dir, 'big.log')
+        with open(big_log, 'w') as file:
+            file.writelines(f"record {i}\n" for i in range(1_000_000))
+        start = time.perf_counter()
+        big_index = LineIndex(big_log)
+        built = time.perf_counter() - start
+        with open(big_log, 'a') as file:
+            file.write("record 1000000\n")
+        start = time.perf_counter()
+        last_line = big_index.get_line(1_000_000)
+        lookup = time.perf_counter() - start
+        print(f"Indexed 1,000,000 lines in {built * 1000:.0f} ms; "
+              f"line 1,000,000 after an append: {last_line!r} in {lookup * 1000:.2f} ms")
@@ -0,0 +1,77 @@
+"""
+The reusable classes, decorators and context managers from the module_2
+lessons, without the demos:
+
+    from module_2 import OrgTree, memoize, Pipeline, my_context_manager
+
+`import module_2` imports none of the lessons. Each name is looked up in
+_EXPORTS the first time it is used (PEP 562 module __getattr__), and only
+the lesson that defines it gets imported. The lessons keep their demos
+behind `if __name__ == '__main__':`, so they still run as scripts.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    # lesson_10: columnar payroll
+    'PayrollStore': 'lesson_10',
+    'EmployeeRow': 'lesson_10',
+    # lesson_11: the Employee hierarchy and the tools built on it
+    'Employee': 'lesson_11',
+    'Developer': 'lesson_11',
+    'Manager': 'lesson_11',
+    'EmployeeRegistry': 'lesson_11',
+    'OrgTree': 'lesson_11',
+    'render_report': 'lesson_11',
+    'EmployeeLoader': 'lesson_11',
+    # lesson_12: memory-lean employees and their binary records
+    'CompactEmployee': 'lesson_12',
+    'CompactDeveloper': 'lesson_12',
+    'CompactManager': 'lesson_12',
+    'bytes_per_instance': 'lesson_12',
+    'StringTable': 'lesson_12',
+    'EmployeeCodec': 'lesson_12',
+    'EmployeeStore': 'lesson_12',
+    # lesson_13: iterators, generators and pipelines
+    'MyRange': 'lesson_13',
+    'my_range_generator': 'lesson_13',
+    'even_numbers': 'lesson_13',
+    'RangeSequence': 'lesson_13',
+    'my_range_blocks': 'lesson_13',
+    'even_number_blocks': 'lesson_13',
+    'filtered_range_blocks': 'lesson_13',
+    'Pipeline': 'lesson_13',
+    'StageStats': 'lesson_13',
+    # lesson_14: decorators
+    'timer_decorator': 'lesson_14',
+    'debug_logger': 'lesson_14',
+    'LatencyHistogram': 'lesson_14',
+    'MetricsRegistry': 'lesson_14',
+    'metrics': 'lesson_14',
+    'metrics_timer': 'lesson_14',
+    'BackgroundLogWriter': 'lesson_14',
+    'stderr_sink': 'lesson_14',
+    'sampled_debug_logger': 'lesson_14',
+    'default_log_writer': 'lesson_14',
+    'memoize': 'lesson_14',
+    # lesson_15: context managers
+    'my_context_manager': 'lesson_15',
+}
+
+_SUBMODULES = ('ex', 'lesson_09', 'lesson_10', 'lesson_11', 'lesson_12', 'lesson_13', 'lesson_14', 'lesson_15')
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return import_module(f'{__name__}.{name}')
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+    globals()[name] = value  # later lookups don't come back here
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
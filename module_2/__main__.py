@@ -0,0 +1,60 @@
+"""
+Import-time benchmark: `python -m module_2` imports every module in a fresh
+interpreter and fails if one of them is over the startup budget, prints
+anything, or (for the packages) drags in a lesson module.
+"""
+
+import os
+import subprocess
+import sys
+
+PACKAGES = ('module_2', 'module_2.ex')
+MODULES = PACKAGES + (
+    'module_2.lesson_09', 'module_2.lesson_10', 'module_2.lesson_11', 'module_2.lesson_12',
+    'module_2.lesson_13', 'module_2.lesson_14', 'module_2.lesson_15',
+    'module_2.ex.l_10_ex', 'module_2.ex.l_15_ex',
+)
+
+# Runs in the child: time the import, then report it and what else got imported
+_CHILD = """
+import importlib, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, *sorted(m for m in set(sys.modules) - before if m.startswith('module_2.') and m != sys.argv[1]))
+"""
+
+
+def benchmark_import_time(modules=MODULES, budget_ms=50.0, repeat=3):
+    """Best-of-repeat import time per module, in ms. Returns the list of problems found."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    problems = []
+    for module in modules:
+        best = None
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, '-c', _CHILD, module], cwd=root,
+                                    capture_output=True, text=True)
+            lines = result.stdout.splitlines()
+            if result.returncode != 0 or len(lines) != 1:
+                problems.append(f"{module}: import printed output or failed:\n{result.stdout}{result.stderr}")
+                break
+            elapsed, *loaded = lines[0].split()
+            best = min(float(elapsed), best if best is not None else float('inf'))
+        if best is None:
+            continue
+        if module in PACKAGES and loaded:
+            problems.append(f"{module}: importing the package also imported {loaded}")
+        over = best > budget_ms
+        if over:
+            problems.append(f"{module}: {best:.1f} ms is over the {budget_ms:.0f} ms budget")
+        print(f"  {module:<22} {best:6.1f} ms{'  OVER BUDGET' if over else ''}")
+    return problems
+
+
+if __name__ == '__main__':
+    print("--- Import time per module (fresh interpreter, best of 3) ---")
+    problems = benchmark_import_time()
+    for problem in problems:
+        print(problem)
+    sys.exit(1 if problems else 0)
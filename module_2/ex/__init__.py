@@ -0,0 +1,48 @@
+"""
+The exercise solutions as a library, without their demos:
+
+    from module_2.ex import User, FollowGraph, db_handler
+
+Like module_2 itself, names are imported from their exercise on first use.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    # l_10_ex: users and the follow graph
+    'User': 'l_10_ex',
+    'PremiumUser': 'l_10_ex',
+    'FollowGraph': 'l_10_ex',
+    'FollowCounters': 'l_10_ex',
+    'LockedFollowCounters': 'l_10_ex',
+    'Leaderboard': 'l_10_ex',
+    'FollowerLeaderboard': 'l_10_ex',
+    'GraphStore': 'l_10_ex',
+    # l_15_ex: database connections
+    'MockDBConnection': 'l_15_ex',
+    'QueryCache': 'l_15_ex',
+    'ConnectionPool': 'l_15_ex',
+    'get_pool': 'l_15_ex',
+    'db_handler': 'l_15_ex',
+    'AsyncMockDBConnection': 'l_15_ex',
+    'async_db_handler': 'l_15_ex',
+    'execute_concurrently': 'l_15_ex',
+}
+
+_SUBMODULES = ('l_10_ex', 'l_15_ex')
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return import_module(f'{__name__}.{name}')
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+    globals()[name] = value  # later lookups don't come back here
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
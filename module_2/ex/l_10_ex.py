@@ -1,4 +1,13 @@
 class User:
+    # Set to a FollowGraph to record who follows whom (see below)
+    graph = None
+    # Set to a FollowCounters to count follows safely from many threads (see below).
+    # While it is set, the followers and is_following attributes are not
+    # updated: read the counts with counters.followers(user) / .following(user)
+    counters = None
+    # Set to a FollowerLeaderboard to keep a live most-followed ranking (see below)
+    leaderboard = None
+
     def __init__(self, user_id, username):
         self.id = user_id
         self.username = username
@@ -6,8 +15,39 @@ class User:
         self.followers = 0
 
     def follow(self, user_to_follow):
-        user_to_follow.followers += 1
-        self.is_following += 1
+        if self.graph is not None and not self.graph.follow(self, user_to_follow):
+            return  # already following
+        if self.counters is not None:
+            self.counters.record_follow(self, user_to_follow)
+        else:
+            user_to_follow.followers += 1
+            self.is_following += 1
+        if self.leaderboard is not None:
+            self.leaderboard.record_follow(user_to_follow)
+
+    def unfollow(self, user_to_unfollow):
+        # Everything is checked before anything changes. The leaderboard only
+        # has the follows made while it was attached, so it may have none to take back
+        leaderboard = self.leaderboard
+        if leaderboard is not None and not leaderboard.overall.score(user_to_unfollow.id):
+            leaderboard = None
+        if self.graph is not None:
+            if not self.graph.unfollow(self, user_to_unfollow):
+                return  # wasn't following
+        elif not self._counted_follow(user_to_unfollow):
+            return  # no graph to ask, but the counts would go below zero
+        if self.counters is not None:
+            self.counters.record_unfollow(self, user_to_unfollow)
+        else:
+            user_to_unfollow.followers -= 1
+            self.is_following -= 1
+        if leaderboard is not None:
+            leaderboard.record_follow(user_to_unfollow, -1)
+
+    def _counted_follow(self, user):
+        if self.counters is not None:
+            return self.counters.following(self) > 0 and self.counters.followers(user) > 0
+        return self.is_following > 0 and user.followers > 0
 
 # child class inheriting from user
 class PremiumUser(User):
@@ -20,19 +60,896 @@ class PremiumUser(User):
         print(f"{self.username} is viewing exclusive content as a {self.subscription_tier} member")
 
 # testing the classes
-standard_user = User("001", "alice")
-premium_user = PremiumUser("002", "bob", "Gold")
+if __name__ == '__main__':
+    standard_user = User("001", "alice")
+    premium_user = PremiumUser("002", "bob", "Gold")
+
+    # PremiumUser can still use methods from User
+    premium_user.follow(standard_user)
+
+    print(f"{premium_user.username} is following {premium_user.is_following} people")
+
+    print(f"{standard_user.username} has {standard_user.followers} followers")
+
+    # and PremiumUser can use its own methods
+    premium_user.view_exclusive_content()
+
+
+    print("\n")
+
+
+"""
+Who follows whom: the counters above can't tell us who the followers are,
+and following the same person twice counts twice. FollowGraph stores the
+follow edges themselves, with each user mapped to a small integer id.
+
+Edges live in two layers: a compact, read-optimized CSR layout (one flat
+array of neighbour ids per direction plus an offsets array saying where
+each user's neighbours start) and a small set-based layer of changes since
+the last compact(). compact() merges the changes into a fresh CSR layout.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+
+class FollowGraph:
+    # follow/unfollow compact() by themselves once this many changes are
+    # pending, or a quarter of the edge count if that is more, so the pending
+    # sets stay small and each edge is copied a bounded number of times
+    COMPACT_AFTER = 1 << 18
+
+    def __init__(self):
+        self._index = {}             # user id -> node number
+        self._user_ids = []          # node number -> user id
+        self._following_count = array('Q')
+        self._follower_count = array('Q')
+        # CSR layout: neighbours of node u are targets[offsets[u]:offsets[u + 1]], sorted
+        self._out_offsets = array('Q', [0])
+        self._out_targets = array('I')
+        self._in_offsets = array('Q', [0])
+        self._in_sources = array('I')
+        # Changes since the last compact(): node -> set of nodes
+        self._added_out, self._added_in = {}, {}
+        self._removed_out, self._removed_in = {}, {}
+        self._pending_changes = 0
+
+    @staticmethod
+    def _user_id(user):
+        return getattr(user, 'id', user)
+
+    def node(self, user):
+        """The node number of a user (a User or a user id), registering it if it is new."""
+        user_id = self._user_id(user)
+        node = self._index.get(user_id)
+        if node is None:
+            node = self._index[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+            self._following_count.append(0)
+            self._follower_count.append(0)
+        return node
+
+    def user_id(self, node):
+        return self._user_ids[node]
+
+    def __len__(self):
+        return len(self._user_ids)
+
+    @staticmethod
+    def _in_base(offsets, targets, u, v):
+        if u + 1 >= len(offsets):
+            return False
+        start, end = offsets[u], offsets[u + 1]
+        position = bisect_left(targets, v, start, end)
+        return position < end and targets[position] == v
+
+    def _has_edge(self, u, v):
+        if v in self._added_out.get(u, ()):
+            return True
+        if v in self._removed_out.get(u, ()):
+            return False
+        return self._in_base(self._out_offsets, self._out_targets, u, v)
+
+    def is_following(self, follower, followee):
+        u = self._index.get(self._user_id(follower))
+        v = self._index.get(self._user_id(followee))
+        return u is not None and v is not None and self._has_edge(u, v)
+
+    def follow(self, follower, followee):
+        """Record that follower follows followee; returns False if they already did."""
+        u, v = self.node(follower), self.node(followee)
+        if u == v:
+            raise ValueError("Users can't follow themselves.")
+        if self._has_edge(u, v):
+            return False
+        if v in self._removed_out.get(u, ()):
+            # Re-following an edge that is still in the CSR layout
+            self._removed_out[u].discard(v)
+            self._removed_in[v].discard(u)
+        else:
+            self._added_out.setdefault(u, set()).add(v)
+            self._added_in.setdefault(v, set()).add(u)
+        self._following_count[u] += 1
+        self._follower_count[v] += 1
+        self._changed()
+        return True
+
+    def unfollow(self, follower, followee):
+        """Remove the follow edge; returns False if there was none."""
+        u = self._index.get(self._user_id(follower))
+        v = self._index.get(self._user_id(followee))
+        if u is None or v is None or not self._has_edge(u, v):
+            return False
+        if v in self._added_out.get(u, ()):
+            self._added_out[u].discard(v)
+            self._added_in[v].discard(u)
+        else:
+            self._removed_out.setdefault(u, set()).add(v)
+            self._removed_in.setdefault(v, set()).add(u)
+        self._following_count[u] -= 1
+        self._follower_count[v] -= 1
+        self._changed()
+        return True
+
+    def _changed(self):
+        self._pending_changes += 1
+        if self._pending_changes >= max(self.COMPACT_AFTER, len(self._out_targets) // 4):
+            self.compact()
+
+    def follower_count(self, user):
+        node = self._index.get(self._user_id(user))
+        return 0 if node is None else self._follower_count[node]
+
+    def following_count(self, user):
+        node = self._index.get(self._user_id(user))
+        return 0 if node is None else self._following_count[node]
+
+    def _neighbours(self, offsets, targets, added, removed, node):
+        if node + 1 < len(offsets):
+            gone = removed.get(node)
+            base = targets[offsets[node]:offsets[node + 1]]
+            yield from base if not gone else (n for n in base if n not in gone)
+        yield from added.get(node, ())
+
+    def followers(self, user):
+        """Iterate over the user ids following user."""
+        node = self._index.get(self._user_id(user))
+        if node is None:
+            return
+        for n in self._neighbours(self._in_offsets, self._in_sources, self._added_in, self._removed_in, node):
+            yield self._user_ids[n]
+
+    def following(self, user):
+        """Iterate over the user ids user follows."""
+        node = self._index.get(self._user_id(user))
+        if node is None:
+            return
+        for n in self._neighbours(self._out_offsets, self._out_targets, self._added_out, self._removed_out, node):
+            yield self._user_ids[n]
+
+    @property
+    def edge_count(self):
+        return sum(self._following_count)
+
+    def _merged(self, offsets, targets, added, removed, degrees):
+        """A new CSR layout with the pending changes applied."""
+        base_nodes = len(offsets) - 1
+        targets = memoryview(targets)  # works for arrays and mapped snapshots alike
+        new_targets = array('I')
+        done = 0  # nodes before this one are already in new_targets
+        for node in sorted(set(added) | set(removed)):
+            # Unchanged nodes: copy their neighbours as one slice
+            run_end = min(node, base_nodes)
+            if done < run_end:
+                new_targets.frombytes(targets[offsets[done]:offsets[run_end]].cast('B'))
+            # Added nodes are never in the base layout, so no deduplication is needed
+            neighbours = targets[offsets[node]:offsets[node + 1]].tolist() if node < base_nodes else []
+            gone = removed.get(node)
+            if gone:
+                neighbours = [n for n in neighbours if n not in gone]
+            neighbours.extend(added.get(node, ()))
+            neighbours.sort()
+            new_targets.extend(neighbours)
+            done = node + 1
+        if done < base_nodes:
+            new_targets.frombytes(targets[offsets[done]:offsets[base_nodes]].cast('B'))
+        # The degree of every node is kept up to date, so the offsets are their running total
+        new_offsets = array('Q', accumulate(degrees, initial=0))
+        return new_offsets, new_targets
+
+    def compact(self):
+        """Fold the pending follows and unfollows into the read-optimized CSR layout."""
+        self._out_offsets, self._out_targets = self._merged(
+            self._out_offsets, self._out_targets, self._added_out, self._removed_out, self._following_count)
+        self._in_offsets, self._in_sources = self._merged(
+            self._in_offsets, self._in_sources, self._added_in, self._removed_in, self._follower_count)
+        self._added_out, self._added_in = {}, {}
+        self._removed_out, self._removed_in = {}, {}
+        self._pending_changes = 0
+
+    def csr(self, direction='following'):
+        """
+        The raw (offsets, neighbours) arrays for analytics, after a compact().
+        Neighbours of node u are neighbours[offsets[u]:offsets[u + 1]].
+        """
+        self.compact()
+        if direction == 'following':
+            return self._out_offsets, self._out_targets
+        if direction == 'followers':
+            return self._in_offsets, self._in_sources
+        raise ValueError("direction must be 'following' or 'followers'.")
+
+
+# Attach a graph so User.follow records edges and ignores repeat follows
+if __name__ == '__main__':
+    User.graph = FollowGraph()
+    carol = User("003", "carol")
+    standard_user.follow(premium_user)
+    carol.follow(premium_user)
+    carol.follow(premium_user)  # already following: not counted again
+    print(f"{premium_user.username} has {premium_user.followers} followers: "
+          f"{sorted(User.graph.followers(premium_user))}")
+    User.graph.compact()
+    carol.unfollow(premium_user)
+    print(f"After carol unfollows: {premium_user.followers} followers, "
+          f"{carol.username} follows {list(User.graph.following(carol))}")
+
+
+"""
+Follow events from many threads: `followers += 1` is a read, an add and a
+write, so two threads can both read 5 and both write 6. One global lock
+fixes that but makes every thread queue up behind it, worst of all on a
+celebrity account. FollowCounters gives every thread its own shard of
+counts to write to, and adds the shards up only when a count is read.
+(On a regular CPython build the GIL still runs one thread at a time, so
+the gain shows up as no lock contention rather than as extra cores.)
+"""
+
+import threading
+import time
+from collections import Counter
+
+
+class FollowCounters:
+    """Sharded follower/following counters: lock-free writes, merge on read."""
+
+    def __init__(self):
+        self._local = threading.local()
+        # (owning thread, followers, following) per thread. The first entry has
+        # no thread: it keeps the counts of threads that have finished.
+        self._shards = [(None, Counter(), Counter())]
+        self._shards_lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            # Only taken once per thread
+            shard = self._local.shard = (Counter(), Counter())
+            with self._shards_lock:
+                self._retire_finished_threads()
+                self._shards.append((threading.current_thread(), *shard))
+        return shard
+
+    def _retire_finished_threads(self):
+        # Called with _shards_lock held. A finished thread writes no more, so its
+        # shard can be folded into the first entry, keeping thread-pool churn
+        # from growing the list. Readers may still hold the old list: the
+        # retired counts go into new Counters and the list is replaced in one
+        # assignment, so no reader sees a shard's counts twice.
+        live, finished = [], []
+        for shard in self._shards[1:]:
+            (live if shard[0].is_alive() else finished).append(shard)
+        if not finished:
+            return
+        _, retired_followers, retired_following = self._shards[0]
+        retired_followers, retired_following = retired_followers.copy(), retired_following.copy()
+        for _, followers, following in finished:
+            retired_followers.update(followers)
+            retired_following.update(following)
+        self._shards = [(None, retired_followers, retired_following)] + live
+
+    @staticmethod
+    def _user_id(user):
+        return getattr(user, 'id', user)
+
+    def record_follow(self, follower, followee, amount=1):
+        # Only this thread writes to its shard, so no lock is needed
+        followers, following = self._shard()
+        followers[self._user_id(followee)] += amount
+        following[self._user_id(follower)] += amount
+
+    def record_unfollow(self, follower, followee):
+        self.record_follow(follower, followee, -1)
+
+    def _shards_snapshot(self):
+        with self._shards_lock:
+            return [(followers, following) for _, followers, following in self._shards]
+
+    @staticmethod
+    def _copy(counts):
+        # Another thread may be adding keys. dict.copy() runs in C without letting
+        # it in, unlike iterating; retry in case a resize gets in anyway.
+        while True:
+            try:
+                return dict.copy(counts)
+            except RuntimeError:
+                pass
+
+    def followers(self, user):
+        user_id = self._user_id(user)
+        return sum(followers.get(user_id, 0) for followers, _ in self._shards_snapshot())
+
+    def following(self, user):
+        user_id = self._user_id(user)
+        return sum(following.get(user_id, 0) for _, following in self._shards_snapshot())
+
+    def totals(self):
+        """
+        (followers, following) Counters merged across every thread's shard.
+        Safe while other threads keep writing; their newest events may not be in it yet.
+        """
+        followers, following = Counter(), Counter()
+        for shard_followers, shard_following in self._shards_snapshot():
+            followers.update(self._copy(shard_followers))
+            following.update(self._copy(shard_following))
+        return followers, following
+
+
+class LockedFollowCounters(FollowCounters):
+    """The one-global-lock version, for comparison."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._counts = (Counter(), Counter())
+        self._shards.append((None, *self._counts))
+
+    def record_follow(self, follower, followee, amount=1):
+        with self._lock:
+            self._counts[0][self._user_id(followee)] += amount
+            self._counts[1][self._user_id(follower)] += amount
+
+
+def benchmark_follow_counters(events_per_thread=100_000, thread_counts=(1, 2, 4, 8)):
+    """
+    Every thread sends follow events, half of them to one celebrity account.
+    Checks the totals are exact and reports events per second.
+    """
+    results = {}
+    for counters_class in (LockedFollowCounters, FollowCounters):
+        for threads in thread_counts:
+            counters = counters_class()
+
+            def worker(worker_id):
+                record = counters.record_follow
+                for i in range(events_per_thread):
+                    record(f"fan{worker_id}-{i % 1000}", "celebrity" if i % 2 else f"user{i % 5000}")
+
+            workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            total = threads * events_per_thread
+            followers, following = counters.totals()
+            assert counters.followers("celebrity") == total // 2
+            assert sum(followers.values()) == sum(following.values()) == total
+            results[counters_class.__name__, threads] = total / elapsed
+            print(f"  {counters_class.__name__:<21} {threads} threads: {total / elapsed:>10,.0f} events/sec (totals exact)")
+    return results
+
+
+# FollowGraph isn't safe to share between threads, so detach it for this demo
+if __name__ == '__main__':
+    User.graph = None
+    User.counters = FollowCounters()
+    dave, erin = User("004", "dave"), User("005", "erin")
+    fans = [User(f"{n:03d}", f"fan{n}") for n in range(100, 108)]
+    fan_threads = [threading.Thread(target=fan.follow, args=(dave,)) for fan in fans]
+    for thread in fan_threads:
+        thread.start()
+    for thread in fan_threads:
+        thread.join()
+    erin.follow(dave)
+    print(f"{dave.username} has {User.counters.followers(dave)} followers, "
+          f"{erin.username} follows {User.counters.following(erin)}")
+    User.counters = None
+
+    print("--- Follow counter stress test ---")
+    benchmark_follow_counters(events_per_thread=20_000, thread_counts=(1, 4))
+
+
+
+"""
+Most-followed users: sorting everybody by followers for every page view is
+O(n log n). A Leaderboard keeps all keys in one list sorted by score, highest
+first, with keys of equal score next to each other, and remembers where each
+score's run starts. A follow moves a user from its run into the neighbouring
+one with a single swap, so it is O(1); "rank of user X" is where X's run
+starts, and top-K is the first K entries. Memory grows with the number of
+users, not with the highest follower count.
+"""
+
+
+class Leaderboard:
+    def __init__(self):
+        self._scores = {}    # key -> score
+        self._keys = []      # every key, highest score first
+        self._position = {}  # key -> index in _keys
+        self._start = {}     # score -> index of the first key with that score
+        self._count = {}     # score -> how many keys have it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _swap(self, i, j):
+        keys, position = self._keys, self._position
+        keys[i], keys[j] = keys[j], keys[i]
+        position[keys[i]] = i
+        position[keys[j]] = j
+
+    def _leave(self, score):
+        self._count[score] -= 1
+        if not self._count[score]:
+            del self._count[score]
+            del self._start[score]
+
+    def _settle_up(self, key, i, score):
+        # key sits at i, just below the runs of higher scores: hop over every
+        # run lower than `score` (one swap each), then join or start its run
+        keys, scores, start = self._keys, self._scores, self._start
+        while i > 0:
+            higher = scores[keys[i - 1]]
+            if higher >= score:
+                break
+            first = start[higher]
+            self._swap(i, first)
+            start[higher] = first + 1
+            i = first
+        if score in self._count:
+            self._count[score] += 1
+        else:
+            start[score] = i
+            self._count[score] = 1
+        scores[key] = score
+
+    def _settle_down(self, key, i, score):
+        # Mirror image of _settle_up; score=None sinks key to the end to remove it
+        keys, scores, start, count = self._keys, self._scores, self._start, self._count
+        while i < len(keys) - 1:
+            lower = scores[keys[i + 1]]
+            if score is not None and lower <= score:
+                break
+            last = start[lower] + count[lower] - 1
+            self._swap(i, last)
+            start[lower] = i
+            i = last
+        if score is None:
+            keys.pop()
+            del self._position[key], scores[key]
+            return
+        if score in count:
+            count[score] += 1
+        else:
+            count[score] = 1
+        start[score] = i
+        scores[key] = score
+
+    def _move(self, key, old, new):
+        if new is not None and new < 0:
+            raise ValueError("Scores can't be negative.")  # before anything has changed
+        if old is None:
+            self._keys.append(key)
+            self._position[key] = len(self._keys) - 1
+            self._settle_up(key, len(self._keys) - 1, new)
+        elif new is not None and new > old:
+            first = self._start[old]
+            self._swap(self._position[key], first)
+            self._leave(old)
+            if old in self._start:
+                self._start[old] = first + 1
+            self._settle_up(key, first, new)
+        elif new is None or new < old:
+            last = self._start[old] + self._count[old] - 1
+            self._swap(self._position[key], last)
+            self._leave(old)
+            self._settle_down(key, last, new)
+
+    def set_score(self, key, score):
+        with self._lock:
+            self._move(key, self._scores.get(key), score)
+
+    def add(self, key, delta=1):
+        """Change key's score by delta (a new key starts at 0); returns the new score."""
+        with self._lock:
+            old = self._scores.get(key)
+            new = (old or 0) + delta
+            self._move(key, old, new)
+            return new
+
+    def remove(self, key):
+        with self._lock:
+            self._move(key, self._scores[key], None)
+
+    def score(self, key):
+        return self._scores.get(key)
+
+    def rank(self, key):
+        """1 + the number of keys with a strictly higher score (ties share a rank)."""
+        with self._lock:
+            return self._start[self._scores[key]] + 1
+
+    def top(self, k=10):
+        """The k highest-scoring (key, score) pairs, highest first."""
+        with self._lock:
+            return [(key, self._scores[key]) for key in self._keys[:k]]
+
+
+class FollowerLeaderboard:
+    """A Leaderboard of follower counts, plus one per PremiumUser subscription_tier."""
+
+    def __init__(self):
+        self.overall = Leaderboard()
+        self.tiers = {}
+        self._users = {}
+
+    def record_follow(self, user, delta=1):
+        self._users[user.id] = user
+        self.overall.add(user.id, delta)
+        tier = getattr(user, 'subscription_tier', None)
+        if tier is not None:
+            board = self.tiers.get(tier)
+            if board is None:
+                board = self.tiers.setdefault(tier, Leaderboard())
+            board.add(user.id, delta)
+
+    def _board(self, tier):
+        return self.overall if tier is None else self.tiers.get(tier, Leaderboard())
+
+    def top(self, k=100, tier=None):
+        """[(user, followers), ...] for the k most-followed users, overall or within a tier."""
+        return [(self._users[user_id], score) for user_id, score in self._board(tier).top(k)]
+
+    def rank(self, user, tier=None):
+        return self._board(tier).rank(user.id)
+
+
+if __name__ == '__main__':
+    User.leaderboard = FollowerLeaderboard()
+    gold_fan = PremiumUser("006", "frank", "Gold")
+    silver_star = PremiumUser("007", "grace", "Silver")
+    for fan in fans:
+        fan.follow(premium_user)
+    for fan in fans[:5]:
+        fan.follow(silver_star)
+    for fan in fans[:2]:
+        fan.follow(gold_fan)
+    print("Top 3:", [(user.username, followers) for user, followers in User.leaderboard.top(3)])
+    print("Top Gold:", [(user.username, followers) for user, followers in User.leaderboard.top(3, tier="Gold")])
+    print(f"{silver_star.username} is ranked #{User.leaderboard.rank(silver_star)}")
+    User.leaderboard = None
+
+
+"""
+Surviving a restart: everything above lives in memory. GraphStore wraps a
+FollowGraph and writes every follow/unfollow to an append-only log (the
+write-ahead log, fsynced in batches), and from time to time writes the
+whole graph as a compact binary snapshot. Starting up maps the latest
+snapshot into memory and only replays the log written after it.
+
+Files in the store's directory:
+    snapshot.bin   the latest snapshot (replaced atomically)
+    wal.<n>        the log of changes made after snapshot generation n
+"""
+
+import mmap
+import os
+import struct
+import sys
+from operator import sub
+
+
+class GraphStore:
+    SNAPSHOT_HEADER = struct.Struct('<8sIBxxxQQQ')  # magic, generation, id kind, nodes, out edges, in edges
+    SNAPSHOT_MAGIC = b'FGSNAP01'
+    RECORD = struct.Struct('<BII')                   # op, follower node, followee node
+    USER = struct.Struct('<BI')                      # op, length of the user id that follows
+    OP_USER, OP_FOLLOW, OP_UNFOLLOW = 1, 2, 3
+
+    def __init__(self, directory, fsync_every=1024):
+        self.directory = directory
+        self.fsync_every = fsync_every
+        self.generation = 0
+        self.bytes_written = 0      # everything written to disk: log and snapshots
+        self.events_logged = 0
+        self._unsynced = 0
+        os.makedirs(directory, exist_ok=True)
+        self.graph = FollowGraph()
+        self._load()
+        self._logged_nodes = len(self.graph)
+        self._wal = open(self._wal_path(self.generation), 'ab')
+
+    def _wal_path(self, generation):
+        return os.path.join(self.directory, f'wal.{generation}')
+
+    @property
+    def _snapshot_path(self):
+        return os.path.join(self.directory, 'snapshot.bin')
+
+    # --- writing ---
+
+    def _log(self, data):
+        self._wal.write(data)
+        self.bytes_written += len(data)
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def _log_new_users(self):
+        # Log the user ids of nodes registered since the last record
+        graph = self.graph
+        while self._logged_nodes < len(graph):
+            user_id = graph.user_id(self._logged_nodes)
+            kind, data = ('s', user_id.encode()) if isinstance(user_id, str) else ('i', str(user_id).encode())
+            self._log(self.USER.pack(self.OP_USER, len(data)) + kind.encode() + data)
+            self._logged_nodes += 1
+
+    def _apply(self, op, follower, followee):
+        changed = (self.graph.follow if op == self.OP_FOLLOW else self.graph.unfollow)(follower, followee)
+        self._log_new_users()
+        if changed:
+            u, v = self.graph.node(follower), self.graph.node(followee)
+            self._log(self.RECORD.pack(op, u, v))
+            self.events_logged += 1
+        return changed
+
+    def follow(self, follower, followee):
+        return self._apply(self.OP_FOLLOW, follower, followee)
+
+    def unfollow(self, follower, followee):
+        return self._apply(self.OP_UNFOLLOW, follower, followee)
+
+    def sync(self):
+        """Flush the log and fsync it: everything logged so far survives a crash."""
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._unsynced = 0
+
+    def snapshot(self):
+        """Write the whole graph as a new snapshot and start a fresh, empty log."""
+        self.sync()
+        graph = self.graph
+        graph.compact()
+        user_ids = graph._user_ids
+        if all(isinstance(user_id, str) for user_id in user_ids):
+            kind, ids_blob = b's', '\0'.join(user_ids).encode()
+        elif all(isinstance(user_id, int) for user_id in user_ids):
+            kind, ids_blob = b'i', array('q', user_ids).tobytes()
+        else:
+            raise TypeError("Snapshots need user ids that are all str or all int.")
+
+        generation = self.generation + 1
+        temp_path = self._snapshot_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, generation, kind[0], len(user_ids),
+                                                 len(graph._out_targets), len(graph._in_sources)))
+            self._write_aligned(file, struct.pack('<Q', len(ids_blob)) + ids_blob)
+            for column in (graph._out_offsets, graph._out_targets, graph._in_offsets, graph._in_sources):
+                self._write_aligned(file, column.tobytes() if isinstance(column, array) else bytes(column))
+            file.flush()
+            os.fsync(file.fileno())
+            self.bytes_written += file.tell()
+        os.replace(temp_path, self._snapshot_path)
+
+        # The snapshot covers everything in the old log, so start a new one
+        self._wal.close()
+        old_wal = self._wal_path(self.generation)
+        self.generation = generation
+        self._wal = open(self._wal_path(generation), 'ab')
+        os.remove(old_wal)
+
+    @staticmethod
+    def _write_aligned(file, data):
+        # Pad every section to 8 bytes so the arrays can be mapped in place
+        file.write(data)
+        file.write(b'\0' * (-len(data) % 8))
+
+    # --- loading ---
+
+    def _load(self):
+        if os.path.exists(self._snapshot_path):
+            self._load_snapshot()
+        self._replay(self._wal_path(self.generation))
+
+    def _load_snapshot(self):
+        with open(self._snapshot_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        magic, generation, kind, nodes, out_edges, in_edges = self.SNAPSHOT_HEADER.unpack_from(view)
+        if magic != self.SNAPSHOT_MAGIC:
+            raise ValueError(f"'{self._snapshot_path}' is not a FollowGraph snapshot")
+        position = self.SNAPSHOT_HEADER.size
+
+        def section(nbytes):
+            nonlocal position
+            start = position
+            position += nbytes + (-nbytes % 8)
+            return view[start:start + nbytes]
+
+        ids_size, = struct.unpack_from('<Q', view, position)
+        position += 8
+        ids_blob = section(ids_size)
+        if kind == ord('s'):
+            user_ids = bytes(ids_blob).decode().split('\0') if nodes else []
+        else:
+            user_ids = array('q', bytes(ids_blob)).tolist()
+
+        columns = []
+        for typecode, length in (('Q', nodes + 1), ('I', out_edges), ('Q', nodes + 1), ('I', in_edges)):
+            data = section(length * array(typecode).itemsize)
+            if sys.byteorder == 'little':
+                columns.append(data.cast(typecode))  # zero-copy: reads go straight to the mapped file
+            else:
+                column = array(typecode, bytes(data))
+                column.byteswap()
+                columns.append(column)
+
+        graph = self.graph
+        graph._user_ids = user_ids
+        # zip/map keep these O(users) loops in C, with no Python code run per node
+        graph._index = dict(zip(user_ids, range(nodes)))
+        graph._out_offsets, graph._out_targets, graph._in_offsets, graph._in_sources = columns
+        graph._following_count = self._degrees(columns[0])
+        graph._follower_count = self._degrees(columns[2])
+        self.generation = generation
+
+    @staticmethod
+    def _degrees(offsets):
+        """A node's degree is the difference between its offset and the next one."""
+        try:
+            import numpy as np
+        except ImportError:
+            return array('Q', map(sub, offsets[1:], offsets[:-1]))
+        offsets = np.frombuffer(offsets, dtype=np.uint64)
+        degrees = array('Q', [0]) * (len(offsets) - 1)
+        np.subtract(offsets[1:], offsets[:-1], out=np.frombuffer(degrees, dtype=np.uint64))
+        return degrees
+
+    def _replay(self, path):
+        """Re-apply the log after the snapshot, dropping a half-written or zero-filled tail."""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as file:
+            data = file.read()
+        graph = self.graph
+        position = 0
+        while position < len(data):
+            op = data[position]
+            if op == self.OP_USER:
+                if position + self.USER.size + 1 > len(data):
+                    break
+                _, length = self.USER.unpack_from(data, position)
+                start = position + self.USER.size + 1
+                if start + length > len(data):
+                    break
+                text = data[start:start + length].decode()
+                graph.node(text if data[start - 1] == ord('s') else int(text))
+                position = start + length
+            elif op in (self.OP_FOLLOW, self.OP_UNFOLLOW):
+                if position + self.RECORD.size > len(data):
+                    break
+                _, u, v = self.RECORD.unpack_from(data, position)
+                change = graph.follow if op == self.OP_FOLLOW else graph.unfollow
+                change(graph.user_id(u), graph.user_id(v))
+                position += self.RECORD.size
+            elif op == 0 or len(data) - position <= self.RECORD.size:
+                # No record starts with 0: the OS left the end of the file
+                # zero-filled (or with garbage shorter than a record) when
+                # the machine went down. Drop it like a torn record
+                break
+            else:
+                raise ValueError(f"Corrupt log '{path}' at byte {position}")
+        if position < len(data):
+            # A crash cut the last record short: drop it
+            with open(path, 'r+b') as file:
+                file.truncate(position)
+
+    def close(self):
+        self.sync()
+        self._wal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def benchmark_restart(directory, users=100_000, edges=1_000_000, tail_events=50_000):
+    """Restart time from snapshot + log tail, and bytes written per logical event."""
+    import random
+    rng = random.Random(0)
+    start = time.perf_counter()
+    with GraphStore(directory, fsync_every=4096) as store:
+        for _ in range(edges):
+            a, b = rng.randrange(users), rng.randrange(users)
+            if a != b:
+                store.follow(f"u{a}", f"u{b}")
+        store.snapshot()
+        for _ in range(tail_events):
+            a, b = rng.randrange(users), rng.randrange(users)
+            if a != b:
+                (store.follow if rng.random() < 0.8 else store.unfollow)(f"u{a}", f"u{b}")
+        events, written = store.events_logged, store.bytes_written
+        edge_count = store.graph.edge_count
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with GraphStore(directory) as reopened:
+        restart = time.perf_counter() - start
+        assert reopened.graph.edge_count == edge_count
+
+    logical = events * GraphStore.RECORD.size
+    print(f"{users:,} users, {edge_count:,} edges: built in {built:.1f} s, restart in {restart * 1000:.0f} ms; "
+          f"{written / logical:.2f} bytes written per logical byte "
+          f"({written / 1e6:.1f} MB for {events:,} events)")
+    return restart, written / logical
 
-# PremiumUser can still use methods from User
-premium_user.follow(standard_user)
 
-print(f"{premium_user.username} is following {premium_user.is_following} people")
+def benchmark_snapshot_load(directory, users=10_000_000, follows_per_user=5):
+    """
+    Restart time at full scale: write a snapshot of `users` users who each
+    follow the next `follows_per_user` users (ids wrap around), then time
+    opening it. Only the snapshot is timed; the log after it is empty.
+    """
+    k = follows_per_user
+    graph = FollowGraph()
+    graph._user_ids = list(range(users))
+    graph._out_offsets = array('Q', range(0, (users + 1) * k, k))
+    graph._out_targets = array('I', (v % users for u in range(users) for v in range(u + 1, u + k + 1)))
+    graph._in_offsets = graph._out_offsets
+    # Follower lists are sorted: only the first k users have followers that wrap around
+    graph._in_sources = array('I', (w for v in range(k) for w in sorted((v - j) % users for j in range(1, k + 1))))
+    graph._in_sources.extend(w for v in range(k, users) for w in range(v - k, v))
+    graph._following_count = array('Q', [k]) * users
+    graph._follower_count = array('Q', [k]) * users
+    with GraphStore(directory) as store:
+        store.graph = graph
+        store._logged_nodes = users
+        store.snapshot()
+        size = os.path.getsize(store._snapshot_path)
+    del graph, store
 
-print(f"{standard_user.username} has {standard_user.followers} followers")
+    start = time.perf_counter()
+    with GraphStore(directory) as reopened:
+        restart = time.perf_counter() - start
+        assert reopened.graph.follower_count(users - 1) == k
+        assert sorted(reopened.graph.followers(0)) == sorted(range(users - k, users))
+    print(f"{users:,} users, {users * k:,} edges ({size / 1e6:.0f} MB snapshot): "
+          f"restart in {restart * 1000:.0f} ms")
+    return restart
 
-# and PremiumUser can use its own methods
-premium_user.view_exclusive_content()
 
+if __name__ == '__main__':
+    import tempfile
 
-print("\n")
+    with tempfile.TemporaryDirectory() as store_dir:
+        with GraphStore(store_dir) as store:
+            User.graph = store
+            alice_again, bob_again = User("001", "alice"), User("002", "bob")
+            alice_again.follow(bob_again)
+            store.snapshot()
+            carol.follow(bob_again)
+        User.graph = None
+        with GraphStore(store_dir) as restarted:
+            print(f"After a restart, bob's followers: {sorted(restarted.graph.followers('002'))}")
 
+        print("--- Restart benchmark ---")
+        benchmark_restart(os.path.join(store_dir, 'bench'), users=20_000, edges=100_000, tail_events=10_000)
+        benchmark_snapshot_load(os.path.join(store_dir, 'full_scale'))
@@ -9,57 +9,586 @@ yield the connection object so it can be used inside the block.
 '''
 
 from contextlib import contextmanager
+from itertools import islice
+import re
+import threading
+import time
 
 class MockDBConnection:
-    def __init__(self, db_name):
+    def __init__(self, db_name, latency=0.0, verbose=True, cache=None):
         self.db_name = db_name
         self.is_connected = False
+        # Simulated network round-trip paid by every call to the database
+        self.latency = latency
+        self.verbose = verbose
+        # Optional QueryCache, usually shared by every connection of a pool
+        self.cache = cache
 
     def connect(self):
         print(f"Connecting to database '{self.db_name}'...")
         self.is_connected = True
         print("Connection successful.")
 
-    def execute_query(self, query):
+    def _check_connected(self):
         if not self.is_connected:
             raise ConnectionError("Connection not established, Database is not connected.")
-        print(f"Executing query: '{query}'...")
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def execute_query(self, query, params=None):
+        self._check_connected()
+        if self.cache is None:
+            return self._run_query(query)
+        if is_write_query(query):
+            result = self._run_query(query)
+            self.cache.invalidate(query_tables(query))
+            return result
+        return self.cache.get_or_execute(query, params, self._run_query)
+
+    def _run_query(self, query):
+        if self.verbose:
+            print(f"Executing query: '{query}'...")
+        self._round_trip()
         return "Query results"
 
+    def execute_many(self, queries, params_seq=None, batch_size=100):
+        """
+        Execute many queries, sending them to the database in batches.
+
+        `queries` is an iterable of query strings, or a single query string
+        when `params_seq` (an iterable of parameter tuples) is given.
+        The connection is checked once, and one round-trip is paid per batch
+        instead of per query. Results are yielded as they arrive, so memory
+        stays flat however many queries are sent.
+        """
+        self._check_connected()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if params_seq is None:
+            if isinstance(queries, str):
+                raise TypeError("execute_many takes an iterable of queries; use execute_query for a single one.")
+            items = ((query, None) for query in queries)
+        else:
+            items = ((queries, params) for params in params_seq)
+        return self._pipeline(items, batch_size)
+
+    def _pipeline(self, items, batch_size):
+        items = iter(items)
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return
+            if self.verbose:
+                print(f"Executing batch of {len(batch)} queries...")
+            self._round_trip()
+            if self.cache is not None:
+                # The writes in this batch have run: results cached from their tables are stale
+                written = set()
+                for query, _ in batch:
+                    if is_write_query(query):
+                        written |= query_tables(query)
+                if written:
+                    self.cache.invalidate(written)
+            for query, params in batch:
+                yield "Query results"
+
     def close(self):
         print(f"Closing connection to database '{self.db_name}'...")
         self.is_connected = False
         print("Connection closed.")
 
-@contextmanager
-def db_handler(db_name):
-    # 1. Setup: Create a connection object and connect
-    conn = MockDBConnection(db_name)
+
+def benchmark_batching(n_queries=1000, latency=0.001, batch_size=100):
+    """Compare one-at-a-time execute_query against batched execute_many."""
+    conn = MockDBConnection("bench_db", latency=latency, verbose=False)
     conn.connect()
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        conn.execute_query(f"SELECT * FROM users WHERE id = {i}")
+    one_at_a_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in conn.execute_many((f"SELECT * FROM users WHERE id = {i}" for i in range(n_queries)),
+                               batch_size=batch_size):
+        pass
+    batched = time.perf_counter() - start
+
+    conn.close()
+    print(f"{n_queries} queries at {latency * 1000:.1f} ms latency: "
+          f"one-at-a-time {one_at_a_time:.3f} secs, "
+          f"batched by {batch_size} {batched:.3f} secs "
+          f"({one_at_a_time / batched:.1f}x faster)")
+    return one_at_a_time, batched
+
+"""
+Result caching: most read traffic repeats the same few queries, so we keep
+their results for a while and drop them as soon as a write touches one of
+the tables they read from.
+"""
+
+from collections import OrderedDict
+
+_WRITE_VERBS = {"insert", "update", "delete", "replace", "merge", "create", "drop", "alter", "truncate"}
+_TABLE_PATTERN = re.compile(r"\b(?:from|join|into|update|table)\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+
+
+def normalize_query(query):
+    """Collapse whitespace and drop a trailing ';' so equivalent queries share a cache key."""
+    return " ".join(query.split()).rstrip(";").rstrip()
+
+
+def is_write_query(query):
+    words = query.split(None, 1)
+    return bool(words) and words[0].lower() in _WRITE_VERBS
+
+
+def query_tables(query):
+    """The (lower-cased) names of the tables a query reads from or writes to."""
+    return {name.lower() for name in _TABLE_PATTERN.findall(query)}
+
+
+class QueryCache:
+    """A thread-safe LRU cache of query results with a per-entry TTL."""
+
+    def __init__(self, max_entries=1024, ttl=60.0, clock=time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (result, expires_at, tables)
+        self._keys_by_table = {}       # table -> set of keys reading from it
+        self._generations = {}         # table -> number of times it was invalidated
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_key(query, params=None):
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+        return normalize_query(query), params
+
+    def get_or_execute(self, query, params, execute):
+        """Return the cached result for `query`, or call `execute(query)` and cache it."""
+        key = self.make_key(query, params)
+        tables = query_tables(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[0]
+                self._remove(key)
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            generations = [self._generations.get(table, 0) for table in tables]
+
+        # Run the query without holding the lock so other lookups aren't blocked
+        result = execute(query)
+        with self._lock:
+            # A write that invalidated one of our tables meanwhile may have
+            # landed after we read: hand the result back, but don't cache it
+            if generations == [self._generations.get(table, 0) for table in tables]:
+                self._store(key, result, tables)
+        return result
+
+    def put(self, query, params, result):
+        key = self.make_key(query, params)
+        tables = query_tables(query)
+        with self._lock:
+            self._store(key, result, tables)
+
+    def _store(self, key, result, tables):
+        # Caller holds the lock
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (result, self._clock() + self.ttl, tables)
+        for table in tables:
+            self._keys_by_table.setdefault(table, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key):
+        # Caller holds the lock
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+    def invalidate(self, tables):
+        """Drop every cached result that read from any of `tables`."""
+        if isinstance(tables, str):
+            tables = {tables}
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._keys_by_table.get(table, ())):
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._entries)
+        return snapshot
+
+    def __len__(self):
+        return len(self._entries)
+
+
+"""
+Connection pooling: connecting is the expensive part, so instead of calling
+connect()/close() every time a 'with' block is entered, we keep a bounded set
+of warm connections around and lend them out.
+"""
+
+from collections import deque
+
+
+class ConnectionPool:
+    """A bounded pool of warm MockDBConnection objects."""
+
+    def __init__(self, db_name, min_size=1, max_size=10, idle_timeout=300.0,
+                 checkout_timeout=None, connection_factory=MockDBConnection, cache=None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self.db_name = db_name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        # None means "block until a connection is free"
+        self.checkout_timeout = checkout_timeout
+        self.connection_factory = connection_factory
+        # A QueryCache shared by every connection this pool hands out
+        self.cache = cache
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, time it was returned)
+        self._size = 0        # connections alive, idle or lent out
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "connections_created": 0,
+            "connections_closed": 0,
+        }
+
+        # Warm up the pool so the first requests don't pay the connect cost
+        for _ in range(min_size):
+            self._idle.append((self._new_connection(), time.monotonic()))
+            self._size += 1
+            self._stats["connections_created"] += 1
+
+    def _new_connection(self):
+        conn = self.connection_factory(self.db_name)
+        if self.cache is not None:
+            conn.cache = self.cache
+        conn.connect()
+        return conn
+
+    def _discard(self, conn):
+        # Caller holds the lock
+        self._size -= 1
+        self._stats["connections_closed"] += 1
+        if conn.is_connected:
+            conn.close()
+
+    def _prune_idle(self, now):
+        # Close connections that sat idle too long, but never go below min_size.
+        # The oldest returned connections are at the left of the deque.
+        while self._idle and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._discard(conn)
+
+    def acquire(self, timeout=None):
+        """
+        Borrow a connection from the pool.
+        Blocks while the pool is exhausted; raises TimeoutError if no
+        connection becomes free within `timeout` seconds.
+        """
+        if timeout is None:
+            timeout = self.checkout_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited_since = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionError(f"Pool for '{self.db_name}' is closed.")
+                self._prune_idle(time.monotonic())
+
+                # Most recently used first: it is the one most likely to be healthy
+                while self._idle:
+                    conn, _ = self._idle.pop()
+                    # Health check on checkout
+                    if conn.is_connected:
+                        return self._checked_out(conn, waited_since)
+                    self._discard(conn)
+
+                if self._size < self.max_size:
+                    # Reserve the slot, then connect without holding the lock
+                    self._size += 1
+                    break
+
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._stats["wait_time"] += time.monotonic() - waited_since
+                    raise TimeoutError(f"No connection to '{self.db_name}' available within {timeout} secs.")
+                self._cond.wait(remaining)
+
+        try:
+            conn = self._new_connection()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            # Counted here, under the lock: acquire() connects without it
+            self._stats["connections_created"] += 1
+            return self._checked_out(conn, waited_since)
+
+    def _checked_out(self, conn, waited_since):
+        # Caller holds the lock
+        self._stats["checkouts"] += 1
+        if waited_since is not None:
+            self._stats["wait_time"] += time.monotonic() - waited_since
+        return conn
+
+    def release(self, conn):
+        """Return a borrowed connection to the pool."""
+        with self._cond:
+            if self._closed or not conn.is_connected:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection; connections still lent out are closed on release."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        """A snapshot of the pool counters, for sizing the pool under load."""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self._size
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = self._size - len(self._idle)
+        return snapshot
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_name, **pool_options):
+    """Return the shared pool for `db_name`, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None:
+            pool = _pools[db_name] = ConnectionPool(db_name, **pool_options)
+        return pool
+
+
+@contextmanager
+def db_handler(db_name, pool=None):
+    # 1. Setup: Borrow a warm connection instead of connecting from scratch
+    if pool is None:
+        pool = get_pool(db_name)
+    conn = pool.acquire()
     try:
         # 2. Yield the connection object for use in the 'with' block
         yield conn
+    finally:
+        # 3. Teardown: Ensure the connection goes back to the pool
+        pool.release(conn)
+
+"""
+asyncio version: with `async with`, a slow query only suspends its own task,
+so the event loop can keep many queries in flight on a single thread.
+"""
+
+from contextlib import asynccontextmanager
+
+# asyncio is slow to import, so the coroutines import it when they first run;
+# by then whoever is awaiting them has loaded it already.
+
+
+class AsyncMockDBConnection:
+    def __init__(self, db_name, latency=0.0, verbose=True):
+        self.db_name = db_name
+        self.is_connected = False
+        self.latency = latency
+        self.verbose = verbose
+
+    async def connect(self):
+        import asyncio
+
+        print(f"Connecting to database '{self.db_name}'...")
+        await asyncio.sleep(0)
+        self.is_connected = True
+        print("Connection successful.")
+
+    async def execute_query(self, query):
+        if not self.is_connected:
+            raise ConnectionError("Connection not established, Database is not connected.")
+        if self.verbose:
+            print(f"Executing query: '{query}'...")
+        if self.latency:
+            import asyncio
+
+            await asyncio.sleep(self.latency)
+        return "Query results"
+
+    async def close(self):
+        print(f"Closing connection to database '{self.db_name}'...")
+        self.is_connected = False
+        print("Connection closed.")
+
+
+@asynccontextmanager
+async def async_db_handler(db_name, latency=0.0, verbose=True):
+    # 1. Setup: Create a connection object and connect
+    conn = AsyncMockDBConnection(db_name, latency=latency, verbose=verbose)
+    await conn.connect()
+    try:
+        # 2. Yield the connection object for use in the 'async with' block
+        yield conn
     finally:
         # 3. Teardown: Ensure the connection is closed
-        conn.close()
+        await conn.close()
+
+
+async def execute_concurrently(conn, queries, limit=10):
+    """
+    Run all `queries` on `conn` at once, with at most `limit` in flight.
+    Results come back in the same order as the queries.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1.")
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(query):
+        async with semaphore:
+            return await conn.execute_query(query)
+
+    return await asyncio.gather(*(run_one(query) for query in queries))
+
+
+async def benchmark_async_concurrency(n_queries=200, latency=0.01, limits=(1, 2, 4, 8, 16, 32, 64)):
+    """Measure queries per second as the concurrency limit grows."""
+    queries = [f"SELECT * FROM users WHERE id = {i}" for i in range(n_queries)]
+    throughput = {}
+    async with async_db_handler("bench_db", latency=latency, verbose=False) as conn:
+        for limit in limits:
+            start = time.perf_counter()
+            await execute_concurrently(conn, queries, limit=limit)
+            elapsed = time.perf_counter() - start
+            throughput[limit] = n_queries / elapsed
+            print(f"concurrency {limit:>3}: {throughput[limit]:>8.0f} queries/sec")
+    return throughput
+
+
+async def async_demo():
+    async with async_db_handler("production_db") as conn:
+        results = await execute_concurrently(conn, ["SELECT * FROM users", "SELECT * FROM events"], limit=2)
+        print(f"Results: {results}")
+
 
 # --- Example Usage ---
-print("--- Test Case 1: Successful operation ---")
-try:
+if __name__ == '__main__':
+    import asyncio
+
+    print("--- Test Case 1: Successful operation ---")
+    try:
+        with db_handler("production_db") as conn:
+            conn.execute_query("SELECT * FROM users")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+    print("\n--- Test Case 2: Operation with an error ---")
+    try:
+        with db_handler("analytics_db") as conn:
+            conn.execute_query("SELECT * FROM events")
+            # Simulate an error
+            raise ValueError("Something went wrong during data processing!")
+    except Exception as e:
+        print(f"Caught expected error: {e}")
+
+
+    # Test Case 2 still hands the connection back to the pool after the
+    # ValueError is raised, proving the teardown works.
+
+    print("\n--- Test Case 3: Many queries share one warm connection ---")
+    for user_id in range(5):
+        with db_handler("production_db") as conn:
+            conn.execute_query(f"SELECT * FROM users WHERE id = {user_id}")
+    print(f"Pool stats: {get_pool('production_db').stats()}")
+
+    print("\n--- Test Case 4: Batched queries ---")
     with db_handler("production_db") as conn:
-        conn.execute_query("SELECT * FROM users")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
-
-print("\n--- Test Case 2: Operation with an error ---")
-try:
-    with db_handler("analytics_db") as conn:
-        conn.execute_query("SELECT * FROM events")
-        # Simulate an error
-        raise ValueError("Something went wrong during data processing!")
-except Exception as e:
-    print(f"Caught expected error: {e}")
-
-
-# Expected output for Test Case 2 shows that "Closing connection"
-# is printed even after the ValueError is raised, proving the teardown works.
\ No newline at end of file
+        results = conn.execute_many("SELECT * FROM users WHERE id = ?", params_seq=((i,) for i in range(250)))
+        print(f"Got {sum(1 for _ in results)} results")
+
+    print("\n--- Benchmark: batched vs one-at-a-time ---")
+    benchmark_batching(n_queries=200, latency=0.001)
+
+    print("\n--- Test Case 5: Cached reads, invalidated by a write ---")
+    cached_pool = ConnectionPool("cached_db", max_size=2, cache=QueryCache(max_entries=100, ttl=30.0))
+    for _ in range(3):
+        with db_handler("cached_db", pool=cached_pool) as conn:
+            conn.execute_query("SELECT * FROM users")
+    with db_handler("cached_db", pool=cached_pool) as conn:
+        conn.execute_query("UPDATE users SET active = 1 WHERE id = 7")
+        conn.execute_query("select   * FROM users;")
+    print(f"Cache stats: {cached_pool.cache.stats()}")
+    cached_pool.close()
+
+    print("\n--- Test Case 6: async with and concurrent queries ---")
+    asyncio.run(async_demo())
+
+    print("\n--- Benchmark: throughput as concurrency grows ---")
+    asyncio.run(benchmark_async_concurrency(n_queries=100, latency=0.01, limits=(1, 4, 16, 64)))
+
+    # Closing the pool is what actually closes the connections
+    for pool in _pools.values():
+        pool.close()
@@ -18,21 +18,22 @@ class User:
         self.is_following += 1 # increment this user's following count
 
 # Now, we can create objects (instances) by passing arguments to the class name
-user_one = User("001", "alice")
-user_two = User("002", "bob")
+if __name__ == '__main__':
+    user_one = User("001", "alice")
+    user_two = User("002", "bob")
 
 
-# The attributes are already set up correctly!
-print(f"{user_one.username} has {user_one.followers} followers.")
-print(f"{user_two.username} has {user_two.followers} followers.")
+    # The attributes are already set up correctly!
+    print(f"{user_one.username} has {user_one.followers} followers.")
+    print(f"{user_two.username} has {user_two.followers} followers.")
 
 
-# now, let's use the method
-user_one.follow(user_two)
+    # now, let's use the method
+    user_one.follow(user_two)
 
-print(f"--- After user_one follows user_two ---")
-print(f"{user_one.username}'s stats: Followers: {user_one.followers}, Following: {user_one.is_following}")
-print(f"{user_two.username}'s stats: Followers: {user_two.followers}, Following: {user_two.is_following}")
+    print(f"--- After user_one follows user_two ---")
+    print(f"{user_one.username}'s stats: Followers: {user_one.followers}, Following: {user_one.is_following}")
+    print(f"{user_two.username}'s stats: Followers: {user_two.followers}, Following: {user_two.is_following}")
 
 # print(user_one)
 # print(user_two)
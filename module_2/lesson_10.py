@@ -27,54 +27,246 @@ class Developer(Employee):
         self.prog_lang = prog_lang
 
 # now we must provide the programming language when creating a Developer
-dev_3 = Developer('John', 'Peter', 80000, 'Python')
-print(dev_3.fullname())
-print(dev_3.email)
-print(dev_3.prog_lang)
+if __name__ == '__main__':
+    dev_3 = Developer('John', 'Peter', 80000, 'Python')
+    print(dev_3.fullname())
+    print(dev_3.email)
+    print(dev_3.prog_lang)
 
-print()
-print(dev_3.pay)
-dev_3.apply_raise()
-print(f"Pay after 10% raise: {dev_3.pay}")
+    print()
+    print(dev_3.pay)
+    dev_3.apply_raise()
+    print(f"Pay after 10% raise: {dev_3.pay}")
 
 
-# let's see the effect
-dev_2 = Developer('Vishnu', 'Webz', 100000, 'Python')
-print(f"Initial pay: {dev_2.pay}")
-dev_2.apply_raise()
-print(f"Pay after 10% raise: {dev_2.pay}")
+    # let's see the effect
+    dev_2 = Developer('Vishnu', 'Webz', 100000, 'Python')
+    print(f"Initial pay: {dev_2.pay}")
+    dev_2.apply_raise()
+    print(f"Pay after 10% raise: {dev_2.pay}")
 
 
-emp_2 = Employee('Test', 'User', 90000)
-print(f"\nInitial pay: {emp_2.pay}")
-emp_2.apply_raise()
-print(f"Pay after 4% raise: {emp_2.pay}")
+    emp_2 = Employee('Test', 'User', 90000)
+    print(f"\nInitial pay: {emp_2.pay}")
+    emp_2.apply_raise()
+    print(f"Pay after 4% raise: {emp_2.pay}")
 
-# create instances
-emp_1 = Employee('John', 'Doe', 50000)
-dev_1 = Developer('Jane', 'Doe', 60000, "JavaScript")
+    # create instances
+    emp_1 = Employee('John', 'Doe', 50000)
+    dev_1 = Developer('Jane', 'Doe', 60000, "JavaScript")
 
-print(emp_1.email)
-print(dev_1.email) # this works because Developer inherits from Employee!
+    print(emp_1.email)
+    print(dev_1.email) # this works because Developer inherits from Employee!
 
-print(dev_1.fullname()) # Methods are also inherited
+    print(dev_1.fullname()) # Methods are also inherited
 
 """
 When we try to access dev_1.email, Python first looks for an __init__ method in the Developer class. Since it doesn't find one, it walks up the "chain of inheritance" to the parent Employee class and uses its __init__ method.
 """
 
 # is dev_1 an instance of Developer?
-print(isinstance(dev_1, Developer))
-print(isinstance(dev_2, Developer))
+if __name__ == '__main__':
+    print(isinstance(dev_1, Developer))
+    print(isinstance(dev_2, Developer))
 
-# is dev_1 an instance of Employee? Yes, because Developer is a child of Employee
-print(isinstance(dev_1, Employee)) # True
+    # is dev_1 an instance of Employee? Yes, because Developer is a child of Employee
+    print(isinstance(dev_1, Employee)) # True
 
-# is the Developer class a subclass of Employee? Yes
-print(issubclass(Developer, Employee)) # True
+    # is the Developer class a subclass of Employee? Yes
+    print(issubclass(Developer, Employee)) # True
 
-# is the Employee class a subclass of Developer?  No
-print(issubclass(Employee, Developer)) # False
+    # is the Employee class a subclass of Developer?  No
+    print(issubclass(Employee, Developer)) # False
+
+"""
+Raising pay for a million employees one object at a time is a Python loop
+over a million apply_raise() calls. A columnar store keeps every employee's
+pay in one NumPy array and their class as a small integer code, so a
+company-wide raise becomes a single array operation.
+"""
+
+import time
+
+
+class PayrollStore:
+    """Employees stored column by column: names in lists, pay and class in NumPy arrays."""
+
+    def __init__(self, classes=(Employee, Developer), capacity=1024):
+        # Importing NumPy is slow, so it waits until a PayrollStore is created
+        try:
+            import numpy as np
+        except ImportError:  # the store needs NumPy; the lesson above does not
+            raise ImportError("PayrollStore requires NumPy (pip install numpy).") from None
+        self.classes = list(classes)
+        self._codes = {cls: code for code, cls in enumerate(self.classes)}
+        # raise_amount per class code, starting from each class's own attribute
+        self.raise_amounts = np.array([cls.raise_amount for cls in self.classes], dtype=np.float64)
+        self.first = []
+        self.last = []
+        self.prog_lang = []
+        self._pay = np.zeros(capacity, dtype=np.int64)
+        self._class_code = np.zeros(capacity, dtype=np.int16)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def pay(self):
+        return self._pay[:self._size]
+
+    @property
+    def class_code(self):
+        return self._class_code[:self._size]
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > len(self._pay):
+            import numpy as np
+            capacity = max(needed, 2 * len(self._pay))
+            self._pay = np.resize(self._pay, capacity)
+            self._class_code = np.resize(self._class_code, capacity)
+
+    def code_of(self, cls):
+        try:
+            return self._codes[cls]
+        except KeyError:
+            raise ValueError(f"{cls.__name__} is not one of this store's classes") from None
+
+    def add(self, first, last, pay, cls=Employee, prog_lang=None):
+        """Append one employee and return its row number."""
+        code = self.code_of(cls)
+        self._reserve(1)
+        row = self._size
+        self._pay[row] = pay
+        self._class_code[row] = code
+        self.first.append(first)
+        self.last.append(last)
+        self.prog_lang.append(prog_lang)
+        self._size += 1
+        return row
+
+    def add_employees(self, employees):
+        """Copy existing Employee/Developer objects into the store."""
+        employees = list(employees)
+        self._reserve(len(employees))
+        start, end = self._size, self._size + len(employees)
+        self._pay[start:end] = [emp.pay for emp in employees]
+        self._class_code[start:end] = [self.code_of(type(emp)) for emp in employees]
+        self.first.extend(emp.first for emp in employees)
+        self.last.extend(emp.last for emp in employees)
+        self.prog_lang.extend(getattr(emp, 'prog_lang', None) for emp in employees)
+        self._size = end
+
+    def set_raise_amount(self, cls, amount):
+        self.raise_amounts[self.code_of(cls)] = amount
+
+    def apply_raise(self, cls=None):
+        """
+        Give every employee of class `cls` (or everyone, when cls is None) their
+        class's raise, truncating like int(pay * raise_amount) does.
+        """
+        import numpy as np
+
+        pay = self.pay
+        if cls is None:
+            # One gather picks each row's raise_amount, one multiply applies them all
+            multipliers = self.raise_amounts[self.class_code]
+            pay[:] = (pay * multipliers).astype(np.int64)
+        else:
+            cohort = self.class_code == self.code_of(cls)
+            pay[cohort] = (pay[cohort] * self.raise_amounts[self.code_of(cls)]).astype(np.int64)
+
+    def __getitem__(self, row):
+        if not -self._size <= row < self._size:
+            raise IndexError("employee row out of range")
+        return EmployeeRow(self, row % self._size)
+
+    def __iter__(self):
+        for row in range(self._size):
+            yield EmployeeRow(self, row)
+
+
+class EmployeeRow:
+    """A lightweight, Employee-like view onto one row of a PayrollStore."""
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @property
+    def first(self):
+        return self.store.first[self.row]
+
+    @property
+    def last(self):
+        return self.store.last[self.row]
+
+    @property
+    def pay(self):
+        return int(self.store.pay[self.row])
+
+    @pay.setter
+    def pay(self, value):
+        self.store.pay[self.row] = value
+
+    @property
+    def prog_lang(self):
+        return self.store.prog_lang[self.row]
+
+    @property
+    def raise_amount(self):
+        return float(self.store.raise_amounts[self.store.class_code[self.row]])
+
+    @property
+    def email(self):
+        return f'{self.first.lower()}.{self.last.lower()}@company.com'
+
+    def employee_class(self):
+        return self.store.classes[self.store.class_code[self.row]]
+
+    def fullname(self):
+        return f'{self.first} {self.last}'
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amount)
+
+
+def benchmark_payroll(n=1_000_000):
+    """A company-wide raise: per-object apply_raise() loop vs one PayrollStore.apply_raise()."""
+    people = [Developer('Jane', 'Doe', 50000 + i % 50000, 'Python') if i % 3 == 0
+              else Employee('John', 'Doe', 40000 + i % 40000) for i in range(n)]
+    store = PayrollStore()
+    store.add_employees(people)
+
+    start = time.perf_counter()
+    for person in people:
+        person.apply_raise()
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.apply_raise()
+    store_time = time.perf_counter() - start
+
+    assert store.pay.tolist() == [person.pay for person in people]
+    print(f"{n:,} raises: object loop {loop_time * 1000:.0f} ms, "
+          f"columnar {store_time * 1000:.1f} ms ({loop_time / store_time:.0f}x faster)")
+    return loop_time, store_time
+
+
+if __name__ == '__main__':
+    from importlib.util import find_spec
+
+    if find_spec('numpy') is not None:
+        payroll = PayrollStore()
+        payroll.add('Jane', 'Doe', 60000, Developer, 'JavaScript')
+        payroll.add('John', 'Doe', 50000)
+        payroll.apply_raise(Developer)  # only the developers' cohort
+        payroll.apply_raise(Employee)   # only the base employees' cohort
+        for row in payroll:
+            print(f"{row.fullname()} ({row.employee_class().__name__}): {row.pay}, {row.email}")
+        benchmark_payroll(200_000)
 
 """
 Python provides two helpful built-in functions to check the relationships between your objects and classes:
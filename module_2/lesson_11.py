@@ -37,19 +37,20 @@ class Developer(Employee):
         # Then, add the info specific to a Developer
         print(f" -> Specialization: {self.prog_lang} Developer")
 
-dev_2 = Developer('Corey', 'Schafer', 105000, 'JavaScript')
+if __name__ == '__main__':
+    dev_2 = Developer('Corey', 'Schafer', 105000, 'JavaScript')
 
-print("\n--- Extending with super() ---")
-dev_2.show_details()
+    print("\n--- Extending with super() ---")
+    dev_2.show_details()
 
-# Create instance
-emp_1 = Employee('John', 'doe', 80000)
-dev_1 = Developer('Jane', 'Doe', 100000, 'Python')
+    # Create instance
+    emp_1 = Employee('John', 'doe', 80000)
+    dev_1 = Developer('Jane', 'Doe', 100000, 'Python')
 
-# Call the same method on both objects
-print("--- Calling show_details() on each object ---")
-emp_1.show_details() # calls Employee.show_details()
-dev_1.show_details() # calls Developer.show_details()
+    # Call the same method on both objects
+    print("--- Calling show_details() on each object ---")
+    emp_1.show_details() # calls Employee.show_details()
+    dev_1.show_details() # calls Developer.show_details()
 
 class Manager(Employee):
     def __init__(self, first, last, pay, employees=None):
@@ -63,14 +64,736 @@ class Manager(Employee):
     def show_details(self):
         print(f"Manager: {self.fullname()}, Pay: ${self.pay}, Supervises: {len(self.employees)} employees")
 
-emp_1 = Employee('John', 'doe', 80000)
-dev1 = Developer('Jane', 'Doe', 100000, 'Python')
-mgr_1 = Manager('Sue', 'Smith', 120000, [dev_1])
+if __name__ == '__main__':
+    emp_1 = Employee('John', 'doe', 80000)
+    dev1 = Developer('Jane', 'Doe', 100000, 'Python')
+    mgr_1 = Manager('Sue', 'Smith', 120000, [dev_1])
 
-# A list containing objects of different, but related, classes
-employees = [emp_1, dev_1, mgr_1]
+    # A list containing objects of different, but related, classes
+    employees = [emp_1, dev_1, mgr_1]
 
-print("\n--- Iterating through a list of employees ---")
-for employee in employees:
-    # we don't care about the specific type, we just call the method!
-    employee.show_details()
\ No newline at end of file
+    print("\n--- Iterating through a list of employees ---")
+    for employee in employees:
+        # we don't care about the specific type, we just call the method!
+        employee.show_details()
+
+
+"""
+Finding people: scanning the whole list for every lookup is O(n). A registry
+keeps dictionaries from email, last name and language to the employees, plus
+a sorted list of names for prefix search, and updates them whenever an
+employee is added, removed or changed through it.
+"""
+
+from bisect import bisect_left, insort
+
+
+class EmployeeRegistry:
+    def __init__(self, employees=()):
+        self._employees = {}      # id(employee) -> employee
+        self._indexed = {}        # id(employee) -> the keys it is indexed under
+        self._by_email = {}       # email -> employee
+        self._by_last = {}        # last name -> {id: employee}
+        self._by_lang = {}        # programming language -> {id: employee}
+        self._names = []          # sorted (name, id) pairs for prefix search
+        self.extend(employees)
+
+    @staticmethod
+    def _keys_for(employee):
+        first = employee.first.casefold()
+        last = employee.last.casefold()
+        lang = getattr(employee, 'prog_lang', None)
+        return {
+            "email": employee.email.casefold(),
+            "last": last,
+            "lang": lang.casefold() if lang else None,
+            # Prefix search matches the first name, the last name or the full name
+            "names": sorted({first, last, f"{first} {last}"}),
+        }
+
+    def _index(self, employee, keys, keep_sorted=True):
+        key = id(employee)
+        other = self._by_email.get(keys["email"])
+        if other is not None and other is not employee:
+            raise ValueError(f"Another employee already has the email {employee.email!r}")
+        self._by_email[keys["email"]] = employee
+        self._by_last.setdefault(keys["last"], {})[key] = employee
+        if keys["lang"] is not None:
+            self._by_lang.setdefault(keys["lang"], {})[key] = employee
+        for name in keys["names"]:
+            if keep_sorted:
+                insort(self._names, (name, key))
+            else:
+                self._names.append((name, key))
+        self._indexed[key] = keys
+
+    def _unindex(self, employee):
+        key = id(employee)
+        keys = self._indexed.pop(key)
+        del self._by_email[keys["email"]]
+        self._discard(self._by_last, keys["last"], key)
+        if keys["lang"] is not None:
+            self._discard(self._by_lang, keys["lang"], key)
+        for name in keys["names"]:
+            position = bisect_left(self._names, (name, key))
+            del self._names[position]
+
+    @staticmethod
+    def _discard(index, value, key):
+        group = index[value]
+        del group[key]
+        if not group:
+            del index[value]
+
+    def add(self, employee):
+        if id(employee) in self._employees:
+            raise ValueError(f"{employee.fullname()} is already registered")
+        self._index(employee, self._keys_for(employee))
+        self._employees[id(employee)] = employee
+
+    def extend(self, employees):
+        """Add many employees, sorting the name index once at the end instead of per insert."""
+        try:
+            for employee in employees:
+                if id(employee) in self._employees:
+                    raise ValueError(f"{employee.fullname()} is already registered")
+                self._index(employee, self._keys_for(employee), keep_sorted=False)
+                self._employees[id(employee)] = employee
+        finally:
+            self._names.sort()
+
+    def remove(self, employee):
+        self._unindex(employee)
+        del self._employees[id(employee)]
+
+    def reindex(self, employee):
+        """Call after changing an employee's fields directly, to bring the indexes up to date."""
+        old_keys = self._indexed[id(employee)]
+        keys = self._keys_for(employee)
+        if keys == old_keys:
+            return
+        self._unindex(employee)
+        try:
+            self._index(employee, keys)
+        except ValueError:
+            # _index() checks the email before touching anything, so just restore the old entries
+            self._index(employee, old_keys)
+            raise
+
+    def update(self, employee, **fields):
+        """Change fields of a registered employee and keep the indexes consistent."""
+        if ("first" in fields or "last" in fields) and "email" not in fields:
+            first = fields.get("first", employee.first)
+            last = fields.get("last", employee.last)
+            fields["email"] = f'{first.lower()}.{last.lower()}@company.com'
+        previous = {}
+        try:
+            for field, value in fields.items():
+                old = getattr(employee, field, None)
+                setattr(employee, field, value)
+                previous[field] = old
+            self.reindex(employee)
+        except BaseException:
+            # Put back the fields that did change, e.g. when a later one is read-only
+            for field, value in reversed(previous.items()):
+                setattr(employee, field, value)
+            raise
+
+    def by_email(self, email):
+        """The employee with this email, or None."""
+        return self._by_email.get(email.casefold())
+
+    def by_last_name(self, last):
+        return list(self._by_last.get(last.casefold(), {}).values())
+
+    def by_language(self, prog_lang):
+        return list(self._by_lang.get(prog_lang.casefold(), {}).values())
+
+    def search(self, prefix, limit=None):
+        """Employees whose first, last or full name starts with prefix (case-insensitive), in name order."""
+        prefix = prefix.casefold()
+        found = {}
+        position = bisect_left(self._names, (prefix,))
+        while position < len(self._names) and (limit is None or len(found) < limit):
+            name, key = self._names[position]
+            if not name.startswith(prefix):
+                break
+            found.setdefault(key, self._employees[key])
+            position += 1
+        return list(found.values())
+
+    def __len__(self):
+        return len(self._employees)
+
+    def __iter__(self):
+        return iter(list(self._employees.values()))
+
+    def __contains__(self, employee):
+        return id(employee) in self._employees
+
+
+if __name__ == '__main__':
+    registry = EmployeeRegistry(employees)
+    registry.add(dev_2)
+    print("\n--- Looking employees up through the registry ---")
+    print([e.fullname() for e in registry.by_last_name('DOE')])
+    print([e.fullname() for e in registry.by_language('javascript')])
+    print(registry.by_email('sue.smith@company.com').fullname())
+    print([e.fullname() for e in registry.search('co')])
+    registry.update(dev_2, last='Smith', prog_lang='Python')
+    print([e.fullname() for e in registry.by_last_name('smith')])
+
+
+"""
+Whole-org questions: a Manager only knows its direct reports, so "what does
+everyone under Sue cost?" means walking the whole subtree each time. An
+OrgTree caches each subtree's totals on its root node and, when something
+changes, only updates the nodes on the path up to the top of the org.
+All walks use explicit stacks, so a 100k-level deep chain is fine.
+"""
+
+
+class _OrgNode:
+    __slots__ = ('employee', 'parent', 'children', 'payroll', 'headcount', 'raise_cost')
+
+    def __init__(self, employee, parent):
+        self.employee = employee
+        self.parent = parent
+        self.children = []
+        # Totals for this node's whole subtree, including itself
+        self.payroll = employee.pay
+        self.headcount = 1
+        self.raise_cost = _raise_cost(employee)
+
+
+def _raise_cost(employee):
+    return int(employee.pay * employee.raise_amount) - employee.pay
+
+
+class OrgTree:
+    def __init__(self):
+        self._nodes = {}  # id(employee) -> _OrgNode
+
+    def _node(self, employee):
+        try:
+            return self._nodes[id(employee)]
+        except KeyError:
+            raise KeyError(f"{employee.fullname()} is not in this org tree") from None
+
+    def _propagate(self, node, payroll, headcount, raise_cost):
+        # Add the deltas to node and every ancestor above it
+        while node is not None:
+            node.payroll += payroll
+            node.headcount += headcount
+            node.raise_cost += raise_cost
+            node = node.parent
+
+    def add(self, employee, manager=None):
+        """Add employee reporting to manager (or as a top-level employee)."""
+        if id(employee) in self._nodes:
+            raise ValueError(f"{employee.fullname()} is already in this org tree")
+        parent = self._node(manager) if manager is not None else None
+        top = self._nodes[id(employee)] = _OrgNode(employee, parent)
+        # Bring along anyone already listed in a Manager's employees, at any depth
+        order = []
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for report in getattr(node.employee, 'employees', ()):
+                if id(report) not in self._nodes:
+                    child = self._nodes[id(report)] = _OrgNode(report, node)
+                    node.children.append(child)
+                    stack.append(child)
+        for node in reversed(order):
+            for child in node.children:
+                node.payroll += child.payroll
+                node.headcount += child.headcount
+                node.raise_cost += child.raise_cost
+            # Reports that were already in the tree elsewhere drop out of this list
+            self._sync_reports(node)
+        if parent is not None:
+            parent.children.append(top)
+            self._sync_reports(parent)
+            self._propagate(parent, top.payroll, top.headcount, top.raise_cost)
+
+    @classmethod
+    def build(cls, pairs):
+        """
+        Build a tree from (employee, manager) pairs, managers listed before their reports.
+        Totals are computed in a single pass at the end instead of once per add().
+        """
+        tree = cls()
+        for employee, manager in pairs:
+            if id(employee) in tree._nodes:
+                raise ValueError(f"{employee.fullname()} is listed twice")
+            parent = tree._node(manager) if manager is not None else None
+            node = tree._nodes[id(employee)] = _OrgNode(employee, parent)
+            if parent is not None:
+                parent.children.append(node)
+        order = []
+        stack = [node for node in tree._nodes.values() if node.parent is None]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children)
+        for node in reversed(order):
+            for child in node.children:
+                node.payroll += child.payroll
+                node.headcount += child.headcount
+                node.raise_cost += child.raise_cost
+            tree._sync_reports(node)
+        return tree
+
+    @staticmethod
+    def _sync_reports(node):
+        # Keep Manager.employees matching the tree
+        if hasattr(node.employee, 'employees'):
+            node.employee.employees = [child.employee for child in node.children]
+
+    def manager_of(self, employee):
+        parent = self._node(employee).parent
+        return parent.employee if parent is not None else None
+
+    def payroll(self, employee):
+        """Total pay of employee and everyone under them, in O(1)."""
+        return self._node(employee).payroll
+
+    def headcount(self, employee):
+        """Number of people under employee, at all depths, in O(1)."""
+        return self._node(employee).headcount - 1
+
+    def raise_cost(self, employee):
+        """What giving employee and everyone under them their raise would cost, in O(1)."""
+        return self._node(employee).raise_cost
+
+    def set_pay(self, employee, pay):
+        node = self._node(employee)
+        old_pay, old_cost = employee.pay, _raise_cost(employee)
+        employee.pay = pay
+        self._propagate(node, pay - old_pay, 0, _raise_cost(employee) - old_cost)
+
+    def apply_raise(self, employee, whole_subtree=False):
+        """Apply employee's raise; with whole_subtree=True, everyone under them gets theirs too."""
+        if not whole_subtree:
+            self.set_pay(employee, int(employee.pay * employee.raise_amount))
+            return
+        top = self._node(employee)
+        old_payroll, old_cost = top.payroll, top.raise_cost
+        # Post-order without recursion: children are totalled before their parent
+        order = []
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children)
+        for node in reversed(order):
+            node.employee.apply_raise()
+            node.payroll = node.employee.pay + sum(child.payroll for child in node.children)
+            node.raise_cost = _raise_cost(node.employee) + sum(child.raise_cost for child in node.children)
+        self._propagate(top.parent, top.payroll - old_payroll, 0, top.raise_cost - old_cost)
+
+    def move(self, employee, new_manager):
+        """Make employee (and their whole subtree) report to new_manager."""
+        node = self._node(employee)
+        new_parent = self._node(new_manager) if new_manager is not None else None
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is node:
+                raise ValueError(f"{employee.fullname()} cannot report to someone in their own subtree")
+            ancestor = ancestor.parent
+        old_parent = node.parent
+        if old_parent is not None:
+            old_parent.children.remove(node)
+            self._sync_reports(old_parent)
+            self._propagate(old_parent, -node.payroll, -node.headcount, -node.raise_cost)
+        node.parent = new_parent
+        if new_parent is not None:
+            new_parent.children.append(node)
+            self._sync_reports(new_parent)
+            self._propagate(new_parent, node.payroll, node.headcount, node.raise_cost)
+
+    def remove(self, employee):
+        """Take employee out of the org; their direct reports move up to their manager."""
+        node = self._node(employee)
+        for child in list(node.children):
+            self.move(child.employee, node.parent.employee if node.parent is not None else None)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            self._sync_reports(node.parent)
+            self._propagate(node.parent, -node.payroll, -1, -node.raise_cost)
+        del self._nodes[id(employee)]
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, employee):
+        return id(employee) in self._nodes
+
+
+if __name__ == '__main__':
+    org = OrgTree()
+    ceo = Manager('Ada', 'King', 250000)
+    org.add(ceo)
+    org.add(mgr_1, ceo)  # brings along mgr_1's reports
+    org.add(emp_1, mgr_1)
+    org.add(dev_2, ceo)
+    print("\n--- Org-wide totals ---")
+    print(f"Under {ceo.fullname()}: {org.headcount(ceo)} people, payroll ${org.payroll(ceo)}, "
+          f"raise would cost ${org.raise_cost(ceo)}")
+    org.apply_raise(mgr_1, whole_subtree=True)
+    org.move(dev_2, mgr_1)
+    mgr_1.show_details()
+    print(f"After raises and a move: payroll ${org.payroll(ceo)}, {mgr_1.fullname()}'s org ${org.payroll(mgr_1)}")
+
+    # A 100,000-level chain: no recursion, so no RecursionError
+    boss = Employee('Top', 'Boss', 100000)
+    links = [boss] + [Employee('Chain', f'Link{i}', 1000) for i in range(100_000)]
+    chain = OrgTree.build(zip(links, [None] + links[:-1]))
+    chain.set_pay(links[-1], 2000)
+    chain.apply_raise(links[50_000], whole_subtree=True)
+    print(f"Chain of {len(chain):,}: headcount {chain.headcount(boss):,}, payroll ${chain.payroll(boss):,}")
+
+
+"""
+Printing a big roster: show_details() is one print per employee (two for a
+Developer), which is millions of small writes for a big company. The report
+renderer formats rows into a buffer and writes it out in large chunks, and
+picks each row's formatter from a dict by type instead of calling a method.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+
+def _employee_text(employee):
+    return f"Employee: {employee.fullname()}, Pay: ${employee.pay}\n"
+
+
+def _developer_text(employee):
+    return (f"Employee: {employee.fullname()}, Pay: ${employee.pay}\n"
+            f" -> Specialization: {employee.prog_lang} Developer\n")
+
+
+def _manager_text(employee):
+    return f"Manager: {employee.fullname()}, Pay: ${employee.pay}, Supervises: {len(employee.employees)} employees\n"
+
+
+def _show_details_text(employee):
+    # Last resort for a show_details() we know nothing about: run it and keep
+    # what it prints. Slow, and it swaps sys.stdout for the whole process
+    captured = io.StringIO()
+    with redirect_stdout(captured):
+        employee.show_details()
+    return captured.getvalue()
+
+
+def _attribute_text(employee):
+    # A class from another lesson without show_details(): go by its attributes
+    if hasattr(employee, 'employees'):
+        return _manager_text(employee)
+    if hasattr(employee, 'prog_lang'):
+        return _developer_text(employee)
+    return _employee_text(employee)
+
+
+_TEXT_FORMATTERS = {Employee: _employee_text, Developer: _developer_text, Manager: _manager_text}
+# A class outside the hierarchy whose show_details() prints the same lines as
+# one of ours says so with a report_kind attribute next to its show_details
+_TEXT_FORMATTERS_BY_KIND = {'employee': _employee_text, 'developer': _developer_text, 'manager': _manager_text}
+REPORT_FIELDS = ('type', 'first', 'last', 'pay', 'email', 'prog_lang', 'reports')
+
+
+def _record(employee):
+    return {
+        'type': type(employee).__name__,
+        'first': employee.first,
+        'last': employee.last,
+        'pay': employee.pay,
+        'email': employee.email,
+        'prog_lang': getattr(employee, 'prog_lang', None),
+        'reports': len(employee.employees) if hasattr(employee, 'employees') else None,
+    }
+
+
+def _text_formatter_for(cls):
+    formatter = _TEXT_FORMATTERS.get(cls)
+    if formatter is None:
+        # Only use a parent's formatter if the subclass didn't change show_details()
+        parent = next((base for base in cls.__mro__ if base in _TEXT_FORMATTERS), None)
+        if parent is not None and getattr(cls, 'show_details', None) is getattr(parent, 'show_details', None):
+            formatter = _TEXT_FORMATTERS[parent]
+        elif hasattr(cls, 'show_details'):
+            owner = next(base for base in cls.__mro__ if 'show_details' in vars(base))
+            formatter = _TEXT_FORMATTERS_BY_KIND.get(vars(owner).get('report_kind'), _show_details_text)
+        else:
+            formatter = _attribute_text
+        _TEXT_FORMATTERS[cls] = formatter
+    return formatter
+
+
+def render_report(employees, out=None, fmt='text', chunk_size=256 * 1024):
+    """
+    Write a report for any iterable of employees to out (default: stdout).
+
+    fmt='text' gives the same lines as calling show_details() on each one,
+    'csv' and 'jsonl' give one record per employee. Rows are buffered and
+    written in chunks of about chunk_size characters, so memory stays flat
+    however long the iterable is. Returns the number of employees written.
+    """
+    if out is None:
+        out = sys.stdout
+    if fmt not in ('text', 'csv', 'jsonl'):
+        raise ValueError(f"Unknown report format {fmt!r}, expected 'text', 'csv' or 'jsonl'.")
+
+    buffer = io.StringIO()
+    csv_writer = None
+    if fmt == 'csv':
+        csv_writer = csv.DictWriter(buffer, fieldnames=REPORT_FIELDS, lineterminator='\n')
+        csv_writer.writeheader()
+
+    formatters = {}  # per-call cache: type -> formatter, one dict lookup per row
+    count = 0
+    for employee in employees:
+        if fmt == 'text':
+            cls = type(employee)
+            formatter = formatters.get(cls)
+            if formatter is None:
+                formatter = formatters[cls] = _text_formatter_for(cls)
+            buffer.write(formatter(employee))
+        elif fmt == 'csv':
+            csv_writer.writerow(_record(employee))
+        else:
+            buffer.write(json.dumps(_record(employee)))
+            buffer.write('\n')
+        count += 1
+        if buffer.tell() >= chunk_size:
+            out.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    out.write(buffer.getvalue())
+    return count
+
+
+def benchmark_report(n=1_000_000):
+    """show_details() print loop vs render_report(), both writing to os.devnull."""
+    roster = [Developer('Jane', 'Doe', 100000, 'Python') if i % 2 else Employee('John', 'Doe', 80000)
+              for i in range(n)]
+    with open(os.devnull, 'w') as devnull:
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            for employee in roster:
+                employee.show_details()
+        print_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        render_report(roster, out=devnull)
+        rendered = time.perf_counter() - start
+    print(f"{n:,} employees: print loop {print_loop * 1000:.0f} ms, "
+          f"render_report {rendered * 1000:.0f} ms ({print_loop / rendered:.1f}x faster)")
+    return print_loop, rendered
+
+
+if __name__ == '__main__':
+    print("\n--- One report instead of one print per employee ---")
+    render_report([emp_1, dev_1, mgr_1])
+    render_report([emp_1, dev_1, mgr_1], fmt='csv')
+    benchmark_report(200_000)
+
+
+"""
+Loading HR exports: instead of hand-written constructor calls, read a CSV or
+JSONL file and build the right class for every row. The file is cut into
+byte ranges on line boundaries and each range is parsed in a separate
+process; finished chunks are handed out in file order as soon as they are
+ready, so downstream code can start before the whole file is loaded.
+"""
+
+EMPLOYEE_TYPES = {'employee': Employee, 'developer': Developer, 'manager': Manager}
+
+
+def _text_field(row, name):
+    # JSON rows can hold numbers or lists where a name belongs
+    value = row.get(name)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string, got {value!r}")
+    return value.strip()
+
+
+def _build_employee(row):
+    """Turn one parsed row (a dict) into an Employee, Developer or Manager."""
+    type_name = _text_field(row, 'type').lower()
+    prog_lang = _text_field(row, 'prog_lang')
+    if not type_name:
+        # No explicit type: anyone with a programming language is a Developer
+        type_name = 'developer' if prog_lang else 'employee'
+    cls = EMPLOYEE_TYPES.get(type_name)
+    if cls is None:
+        raise ValueError(f"unknown employee type {row.get('type')!r}")
+    first = _text_field(row, 'first')
+    last = _text_field(row, 'last')
+    if not first or not last:
+        raise ValueError("first and last name are required")
+    pay = int(row['pay']) if row.get('pay') not in (None, '') else None
+    if pay is None or pay < 0:
+        raise ValueError(f"invalid pay {row.get('pay')!r}")
+    if cls is Developer:
+        if not prog_lang:
+            raise ValueError("a Developer needs a prog_lang")
+        return Developer(first, last, pay, prog_lang)
+    return cls(first, last, pay)
+
+
+def _parse_lines(lines, fmt, header):
+    """Parse lines into (employees, bad rows); a bad row is (line index, reason, text)."""
+    employees = []
+    bad_rows = []
+    for index, line in enumerate(lines):
+        try:
+            if fmt == 'csv':
+                # A reader per line: with one shared reader, an unclosed quote
+                # would swallow the rest of the chunk as a single field
+                values = next(csv.reader([line]), [])
+                if not values:
+                    continue
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} fields, got {len(values)}")
+                row = dict(zip(header, values))
+            else:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("each line must be a JSON object")
+            employees.append(_build_employee(row))
+        except (ValueError, KeyError, TypeError, csv.Error) as e:
+            bad_rows.append((index, str(e), line.rstrip('\r\n')))
+    return employees, bad_rows
+
+
+def _parse_chunk(path, start, end, fmt, header, encoding):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    # Split on '\n' only, as the chunk boundaries are: str.splitlines would also
+    # break at U+2028 and friends, which JSON strings may contain
+    lines = io.StringIO(data.decode(encoding), newline='\n').readlines()
+    employees, bad_rows = _parse_lines(lines, fmt, header)
+    return employees, bad_rows, len(lines)
+
+
+class EmployeeLoader:
+    """
+    Streams Employee/Developer/Manager objects out of a CSV or JSONL file.
+
+    Rows have first, last and pay, plus optional prog_lang and type
+    (Employee, Developer or Manager; without it, a row with a prog_lang is
+    a Developer). CSV files need a header line, and rows must not contain
+    embedded newlines, since chunks are split on line boundaries.
+
+    Iterate over the loader to get the employees in file order. Bad rows are
+    skipped and collected in bad_rows as (line number, reason, text).
+    workers=0 parses in this process, which is best for small files.
+    """
+
+    def __init__(self, path, fmt=None, workers=None, chunk_bytes=4 * 1024 * 1024, encoding='utf-8'):
+        if fmt is None:
+            fmt = 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+        if fmt not in ('csv', 'jsonl'):
+            raise ValueError(f"Unknown format {fmt!r}, expected 'csv' or 'jsonl'.")
+        self.path = path
+        self.fmt = fmt
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_bytes = chunk_bytes
+        self.encoding = encoding
+        self.bad_rows = []
+        self.loaded = 0
+
+    def _chunks(self):
+        """The header (for CSV) and the byte ranges to parse, each ending on a line boundary."""
+        size = os.path.getsize(self.path)
+        header = None
+        with open(self.path, 'rb') as file:
+            start = 0
+            if self.fmt == 'csv':
+                header_line = file.readline()
+                header = [name.strip() for name in next(csv.reader([header_line.decode(self.encoding)]), [])]
+                start = file.tell()
+            ranges = []
+            while start < size:
+                file.seek(min(start + self.chunk_bytes, size))
+                file.readline()  # move on to the end of the line we landed in
+                end = min(file.tell(), size) if start + self.chunk_bytes < size else size
+                ranges.append((start, end))
+                start = end
+        return header, ranges
+
+    def __iter__(self):
+        header, ranges = self._chunks()
+        first_line = 2 if self.fmt == 'csv' else 1
+        args = [(self.path, start, end, self.fmt, header, self.encoding) for start, end in ranges]
+        for employees, bad_rows, line_count in self._parsed(args):
+            for index, reason, text in bad_rows:
+                self.bad_rows.append((first_line + index, reason, text))
+            first_line += line_count
+            self.loaded += len(employees)
+            yield from employees
+
+    def _parsed(self, args):
+        if self.workers <= 1 or len(args) <= 1:
+            for chunk_args in args:
+                yield _parse_chunk(*chunk_args)
+            return
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Forked workers already have the classes; a spawned one would re-run this script
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            # Keep a bounded number of chunks in flight and hand them out in order
+            pending = []
+            chunks = iter(args)
+            for chunk_args in chunks:
+                pending.append(pool.submit(_parse_chunk, *chunk_args))
+                if len(pending) >= 2 * self.workers:
+                    break
+            while pending:
+                result = pending.pop(0).result()
+                next_args = next(chunks, None)
+                if next_args is not None:
+                    pending.append(pool.submit(_parse_chunk, *next_args))
+                yield result
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    print("\n--- Loading employees from an HR export ---")
+    with tempfile.TemporaryDirectory() as export_dir:
+        export_path = os.path.join(export_dir, 'hr_export.csv')
+        with open(export_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['type', 'first', 'last', 'pay', 'prog_lang'])
+            writer.writerow(['', 'John', 'Doe', 50000, ''])
+            writer.writerow(['', 'Jane', 'Doe', 60000, 'JavaScript'])
+            writer.writerow(['Manager', 'Sue', 'Smith', 120000, ''])
+            writer.writerow(['', 'Bad', 'Pay', 'lots', ''])
+        with open(export_path, 'a', newline='') as file:
+            file.write('"Bad,Quote,50000,\n')  # unclosed quote
+            writer = csv.writer(file)
+            for i in range(20_000):
+                writer.writerow(['Developer', 'Dev', f'Number{i}', 90000, 'Python'])
+        loader = EmployeeLoader(export_path, workers=2, chunk_bytes=64 * 1024)
+        loaded = iter(loader)
+        for employee in [next(loaded) for _ in range(3)]:
+            employee.show_details()
+        remaining = sum(1 for _ in loaded)
+        print(f"Loaded {loader.loaded:,} employees; bad rows: {loader.bad_rows}")
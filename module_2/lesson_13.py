@@ -2,25 +2,27 @@
 
 # a simple for loop what we normally writes
 
-nums_list = [1, 2, 3]
+if __name__ == '__main__':
+    nums_list = [1, 2, 3]
 
-for num in nums_list:
-    print(num)
+    for num in nums_list:
+        print(num)
 
-print("-" * 20)
+    print("-" * 20)
 
-# what python does in the background
+    # what python does in the background
 
-nums_iterator = iter(nums_list) # calls nums_list.iter__() to get an iterator
+    nums_iterator = iter(nums_list) # calls nums_list.iter__() to get an iterator
+
+    while True:
+        try:
+            # get the next item from the iterator
+            item = next(nums_iterator) # calls nums_iterator.__next__()
+            print(item)
+        except StopIteration:
+            # The iterator is exhausted, so we stop the loop
+            break
 
-while True:
-    try:
-        # get the next item from the iterator
-        item = next(nums_iterator) # calls nums_iterator.__next__()
-        print(item)
-    except StopIteration:
-        # The iterator is exhausted, so we stop the loop
-        break
 """
 1: iter(iterable) returns an iterator.
 2: next(iterator) returns the next item.
@@ -31,9 +33,12 @@ while True:
 class MyRange:
     """A custom iterator that mimics the behavior of range()."""
 
-    def __init__(self, start, end):
+    def __init__(self, start, end, step=1):
+        if step == 0:
+            raise ValueError("MyRange() step must not be zero")
         self.value = start
         self.end = end
+        self.step = step
 
     def __iter__(self):
         # This method makes the object an iterable.
@@ -42,26 +47,27 @@ class MyRange:
 
     def __next__(self):
         # This method makes the object an iterator.
-        if self.value >= self.end:
+        if (self.value >= self.end) if self.step > 0 else (self.value <= self.end):
             # Signal that the iteration is complete.
             raise StopIteration
 
         # Get the current value to return
         current_value = self.value
         # Increment for the next call
-        self.value += 1
+        self.value += self.step
         return current_value
 
 
 
 
-print("-" * 20)
+if __name__ == '__main__':
+    print("-" * 20)
 
 
-# Now we can use our custom iterator in a for loop!
-nums = MyRange(1, 5)
-for num in nums:
-    print(num)  # Prints 1, 2, 3, 4
+    # Now we can use our custom iterator in a for loop!
+    nums = MyRange(1, 5)
+    for num in nums:
+        print(num)  # Prints 1, 2, 3, 4
 
 
 def my_range_generator(start, end):
@@ -72,9 +78,10 @@ def my_range_generator(start, end):
         current += 1
 
 # using the generator is the same as using the class-based iterator
-nums = my_range_generator(1, 10)
-for num in nums:
-    print(num)
+if __name__ == '__main__':
+    nums = my_range_generator(1, 10)
+    for num in nums:
+        print(num)
 
 # # lets confirm it's an iterator
 # print(next(nums))
@@ -84,24 +91,25 @@ for num in nums:
 The Ultimate Benefit: Memory Efficiency
 The most significant advantage of generators is their memory efficiency. They produce values one at a time, on-demand—a concept known as lazy evaluation. A regular function would have to create a list of all the values and return it at once, consuming a large amount of memory for big datasets.
 """
-print("#" * 25)
+if __name__ == '__main__':
+    print("#" * 25)
 
-# list comprehension (creates a list in memory)
-my_list = [i * i for i in range(1, 11)]
+    # list comprehension (creates a list in memory)
+    my_list = [i * i for i in range(1, 11)]
 
-# generator expression (creates a generator-iterator)
-my_generator = (i * i for i in range(1, 11))
+    # generator expression (creates a generator-iterator)
+    my_generator = (i * i for i in range(1, 11))
 
-print("List:", my_list)
-print("Generator object:", my_generator)
+    print("List:", my_list)
+    print("Generator object:", my_generator)
 
-# you can loop over the generator to get its values
-print("Values from generator:")
-for val in my_generator:
-    print(val, end=' ')
+    # you can loop over the generator to get its values
+    print("Values from generator:")
+    for val in my_generator:
+        print(val, end=' ')
 
-print('\n')
-print('*' * 25)
+    print('\n')
+    print('*' * 25)
 
 """
 Write a generator function named even_numbers that takes two arguments, start and end. It should yield all the even numbers in the range from start to end (inclusive).
@@ -119,9 +127,10 @@ def even_numbers(start, end):
         yield current
         current += 2 # move to the next even number
 # test the generator
-print("Even numbers from 10 to 20:")
-for number in even_numbers(10, 20):
-    print(number)
+if __name__ == '__main__':
+    print("Even numbers from 10 to 20:")
+    for number in even_numbers(10, 20):
+        print(number)
 
 """
 What actually happens when you run it:
@@ -142,6 +151,521 @@ Adds 2 → 14
 Output will be: 10, 12, 14, 16, 18, 20
 """
 
+if __name__ == '__main__':
+    print('*' * 25)
+
+"""
+MyRange is a one-shot iterator: after one loop it is used up, and `x in` or
+len() would have to walk every value. RangeSequence is a re-iterable,
+range()-like sequence: every question about it is answered with arithmetic
+on start, stop and step, in O(1), however many values it covers. Each loop
+over it gets its own fresh MyRange iterator.
+"""
+
+from collections.abc import Sequence
+from numbers import Integral
+
+
+class RangeSequence(Sequence):
+    """An immutable sequence of integers start, start+step, ... stopping before stop."""
+
+    def __init__(self, start, stop=None, step=1):
+        if stop is None:
+            start, stop = 0, start
+        if step == 0:
+            raise ValueError("RangeSequence() step must not be zero")
+        self.start = start
+        self.stop = stop
+        self.step = step
+
+    @staticmethod
+    def _length(start, stop, step):
+        if step > 0:
+            return max(0, (stop - start + step - 1) // step)
+        return max(0, (start - stop - step - 1) // -step)
+
+    @property
+    def length(self):
+        """Number of values; unlike len(), not limited to sys.maxsize."""
+        return self._length(self.start, self.stop, self.step)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        # A new iterator every time, so the sequence can be looped over again and again
+        return MyRange(self.start, self.stop, self.step)
+
+    def __reversed__(self):
+        n = self.length
+        if not n:
+            return MyRange(self.start, self.start, 1)
+        last = self.start + (n - 1) * self.step
+        return MyRange(last, self.start - self.step, -self.step)
+
+    def __getitem__(self, index):
+        n = self.length
+        if isinstance(index, slice):
+            # Slicing gives another lazy RangeSequence, never a list
+            first, last, step = index.indices(n)
+            count = self._length(first, last, step)
+            new_step = self.step * step
+            new_start = self.start + first * self.step
+            return RangeSequence(new_start, new_start + count * new_step, new_step)
+        if not isinstance(index, Integral):
+            raise TypeError(f"RangeSequence indices must be integers or slices, not {type(index).__name__}")
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("RangeSequence index out of range")
+        return self.start + index * self.step
+
+    def _position(self, value):
+        # The index of value, or None, in O(1)
+        if isinstance(value, bool) or not isinstance(value, Integral):
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            else:
+                return None
+        offset, remainder = divmod(value - self.start, self.step)
+        if remainder or not 0 <= offset < self.length:
+            return None
+        return offset
+
+    def __contains__(self, value):
+        return self._position(value) is not None
+
+    def index(self, value, start=0, stop=None):
+        position = self._position(value)
+        if position is None:
+            raise ValueError(f"{value!r} is not in RangeSequence")
+        first, last, _ = slice(start, stop).indices(self.length)
+        if not first <= position < last:
+            raise ValueError(f"{value!r} is not in RangeSequence")
+        return position
+
+    def count(self, value):
+        return int(value in self)
+
+    def __eq__(self, other):
+        # Equal when they produce the same values, like range()
+        if not isinstance(other, RangeSequence):
+            return NotImplemented
+        n = self.length
+        if n != other.length:
+            return False
+        if n == 0:
+            return True
+        return self.start == other.start and (n == 1 or self.step == other.step)
+
+    def __hash__(self):
+        n = self.length
+        if n == 0:
+            return hash((0, None, None))
+        return hash((n, self.start, self.step if n > 1 else None))
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        if self.step == 1:
+            return f'{class_name}({self.start!r}, {self.stop!r})'
+        return f'{class_name}({self.start!r}, {self.stop!r}, {self.step!r})'
+
+
+if __name__ == '__main__':
+    ids = RangeSequence(0, 10**12, 7)
+    print(f"{ids!r}: {len(ids):,} values, last is {ids[-1]:,}")
+    print(f"700_000_000_007 in ids: {700_000_000_007 in ids}, index: {ids.index(700_000_000_007):,}")
+    partition = ids[1000:2000:10]
+    print(f"Partition {partition!r} has {len(partition)} values")
+    print(list(RangeSequence(1, 5)), list(reversed(RangeSequence(1, 5))))
+    small = RangeSequence(1, 5)
+    print(list(small), list(small))  # re-iterable, unlike MyRange
+
+    print('*' * 25)
+
+"""
+One value per next() is fine for a few thousand numbers, but with billions
+the interpreter overhead per value is the whole cost. The block versions
+below yield the same values in contiguous chunks - NumPy arrays when NumPy
+is installed, array.array otherwise - so numeric code can work on a whole
+block at once.
+"""
+
+import time
+from array import array
+
+# NumPy takes longer to import than the rest of this file, so it is only
+# imported once a block is actually requested; without it, blocks fall
+# back to array.array
+
+
+def _has_numpy():
+    from importlib.util import find_spec
+    return find_spec('numpy') is not None
+
+
+def _block_backend(backend):
+    if backend is None:
+        backend = 'numpy' if _has_numpy() else 'array'
+    if backend == 'numpy' and not _has_numpy():
+        raise ImportError("backend='numpy' requires NumPy (pip install numpy).")
+    if backend not in ('numpy', 'array'):
+        raise ValueError(f"Unknown backend {backend!r}, expected 'numpy' or 'array'.")
+    return backend
+
+
+def _arange(start, stop, step, backend):
+    if backend == 'numpy':
+        import numpy as np
+        return np.arange(start, stop, step, dtype=np.int64)
+    return array('q', range(start, stop, step))
+
+
+def my_range_blocks(start, end, block_size=65536, backend=None):
+    """Block version of my_range_generator: start up to, but not including, end."""
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1.")
+    backend = _block_backend(backend)
+    for block_start in range(start, end, block_size):
+        yield _arange(block_start, min(block_start + block_size, end), 1, backend)
+
+
+def even_number_blocks(start, end, block_size=65536, backend=None, use_filter=False):
+    """
+    Block version of even_numbers: the even numbers from start to end, inclusive.
+
+    By default each block is generated directly with step 2. With
+    use_filter=True (NumPy only) it takes consecutive numbers and keeps the
+    even ones with a vectorized mask, which is how any other predicate
+    would work - see filtered_range_blocks.
+    """
+    if use_filter:
+        yield from filtered_range_blocks(start, end + 1, lambda block: block % 2 == 0, block_size)
+        return
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1.")
+    backend = _block_backend(backend)
+    first = start + (start % 2)  # if the starting number is odd, move to the next one
+    span = 2 * block_size
+    for block_start in range(first, end + 1, span):
+        yield _arange(block_start, min(block_start + span, end + 1), 2, backend)
+
+
+def filtered_range_blocks(start, end, predicate, block_size=65536):
+    """
+    Numbers from start up to (not including) end for which predicate holds,
+    in blocks. predicate gets a whole NumPy block and returns a boolean mask,
+    e.g. lambda block: (block % 3 == 0) & (block % 5 != 0).
+    Empty blocks are skipped.
+    """
+    _block_backend('numpy')
+    for block in my_range_blocks(start, end, block_size, backend='numpy'):
+        selected = block[predicate(block)]
+        if len(selected):
+            yield selected
+
+
+def _block_sum(block):
+    # ndarray.sum() runs in C; array.array has no sum() of its own
+    return sum(block) if isinstance(block, array) else int(block.sum())
+
+
+def benchmark_blocks(end=10_000_000, block_size=65536):
+    """Values per second: summing the scalar generators vs the block versions."""
+    timings = {}
+
+    def timed(name, total_fn):
+        start = time.perf_counter()
+        total = total_fn()
+        elapsed = time.perf_counter() - start
+        timings[name] = end / elapsed
+        print(f"  {name:<32} {end / elapsed:>14,.0f} values/sec")
+        return total
+
+    scalar = timed("my_range_generator", lambda: sum(my_range_generator(0, end)))
+    blocked = timed("my_range_blocks", lambda: sum(_block_sum(block) for block in my_range_blocks(0, end, block_size)))
+    assert scalar == blocked
+    scalar = timed("even_numbers", lambda: sum(even_numbers(0, end)))
+    blocked = timed("even_number_blocks", lambda: sum(_block_sum(block) for block in even_number_blocks(0, end, block_size)))
+    assert scalar == blocked
+    if _has_numpy():
+        filtered = timed("even_number_blocks(use_filter)",
+                         lambda: sum(_block_sum(block) for block in even_number_blocks(0, end, block_size, use_filter=True)))
+        assert scalar == filtered
+    return timings
+
+
+if __name__ == '__main__':
+    print("Even numbers from 10 to 20, in blocks of 4:")
+    for block in even_number_blocks(10, 20, block_size=4):
+        print(block.tolist())
+    print("Block throughput:")
+    benchmark_blocks(end=2_000_000)
+
+    print('*' * 25)
+
+"""
+Pipelines: nesting generators - filter(f, map(g, source)) - gets hard to
+read and tells you nothing about which step is slow. Pipeline chains the
+same lazy steps with method calls, can run a slow map/filter step on a
+thread or process pool, and measures every stage.
+
+Backpressure comes from the pull model: a parallel stage keeps at most
+max_in_flight items submitted, and only asks upstream for more when the
+next stage asks it for an item.
+"""
+
+from collections import deque
+from functools import partial
+from itertools import islice
+
+
+def _timed_call(func, item):
+    # Runs in the worker, so it has to be a module-level (picklable) function
+    start = time.perf_counter()
+    result = func(item)
+    return result, time.perf_counter() - start
+
+
+def _keep_if(predicate, item):
+    return item, predicate(item)
+
+
+class StageStats:
+    """What one stage did: items produced, time spent in its own work, queue depth."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample_depth(self, depth):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def summary(self):
+        return {
+            "items": self.items,
+            "busy_seconds": self.busy_seconds,
+            "items_per_sec": self.items / self.busy_seconds if self.busy_seconds else float('inf'),
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": self._depth_total / self._depth_samples if self._depth_samples else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    A lazy chain of stages over a source iterable, for example:
+
+        Pipeline(my_range_generator(1, 1000)).map(parse, workers=4).filter(valid).batch(100).sink(save)
+
+    Nothing runs until the pipeline is iterated or sink() is called.
+    """
+
+    def __init__(self, source, name='source'):
+        self.stats = []
+        self._iterator = self._timed_source(iter(source), self._new_stats(name))
+
+    def _new_stats(self, name):
+        stats = StageStats(name)
+        self.stats.append(stats)
+        return stats
+
+    def _name(self, kind, func=None):
+        label = kind if func is None else f"{kind}({getattr(func, '__name__', 'fn')})"
+        return f"{len(self.stats)}:{label}"
+
+    @staticmethod
+    def _timed_source(iterator, stats):
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stats.busy_seconds += clock() - start
+                return
+            stats.busy_seconds += clock() - start
+            stats.items += 1
+            yield item
+
+    def _chain(self, generator):
+        self._iterator = generator
+        return self
+
+    # --- stages ---
+
+    def map(self, func, name=None, workers=0, executor='thread', ordered=True, max_in_flight=None):
+        """
+        Apply func to every item. With workers > 0 the calls run on a thread
+        pool (executor='thread') or a process pool (executor='process'; func
+        must then be a module-level function), with at most max_in_flight
+        items submitted at a time (default 2 * workers). ordered=False yields
+        results as they complete.
+        """
+        stats = self._new_stats(name or self._name('map', func))
+        if workers:
+            return self._chain(self._parallel(self._iterator, _timed_call, func, stats,
+                                              workers, executor, ordered, max_in_flight))
+        return self._chain(self._serial_map(self._iterator, func, stats))
+
+    def filter(self, predicate, name=None, workers=0, executor='thread', ordered=True, max_in_flight=None):
+        """Keep the items for which predicate(item) is true; parallel options as for map()."""
+        stats = self._new_stats(name or self._name('filter', predicate))
+        if workers:
+            kept = self._parallel(self._iterator, _timed_call, partial(_keep_if, predicate), stats,
+                                  workers, executor, ordered, max_in_flight, count_items=False)
+            return self._chain(self._count((item for item, keep in kept if keep), stats))
+        return self._chain(self._serial_filter(self._iterator, predicate, stats))
+
+    def batch(self, size, name=None):
+        """Group items into lists of size items (the last one may be shorter)."""
+        if size < 1:
+            raise ValueError("batch size must be at least 1.")
+        stats = self._new_stats(name or self._name(f'batch[{size}]'))
+
+        def batches(iterator):
+            while True:
+                chunk = list(islice(iterator, size))
+                if not chunk:
+                    return
+                stats.items += 1
+                yield chunk
+        return self._chain(batches(self._iterator))
+
+    def window(self, size, step=1, name=None):
+        """Sliding windows: tuples of size consecutive items, starting every step items."""
+        if size < 1 or step < 1:
+            raise ValueError("window size and step must be at least 1.")
+        stats = self._new_stats(name or self._name(f'window[{size}]'))
+
+        def windows(iterator):
+            current = deque(maxlen=size)
+            until_next = 0
+            for item in iterator:
+                current.append(item)
+                if len(current) == size:
+                    if until_next == 0:
+                        stats.items += 1
+                        yield tuple(current)
+                        until_next = step
+                    until_next -= 1
+        return self._chain(windows(self._iterator))
+
+    def sink(self, func=None, name=None):
+        """Run the pipeline to the end, passing every item to func; returns the item count."""
+        stats = self._new_stats(name or self._name('sink', func))
+        clock = time.perf_counter
+        for item in self._iterator:
+            if func is not None:
+                start = clock()
+                func(item)
+                stats.busy_seconds += clock() - start
+            stats.items += 1
+        return stats.items
+
+    def __iter__(self):
+        return self._iterator
+
+    # --- plumbing ---
+
+    @staticmethod
+    def _serial_map(iterator, func, stats):
+        clock = time.perf_counter
+        for item in iterator:
+            start = clock()
+            result = func(item)
+            stats.busy_seconds += clock() - start
+            stats.items += 1
+            yield result
+
+    @staticmethod
+    def _serial_filter(iterator, predicate, stats):
+        clock = time.perf_counter
+        for item in iterator:
+            start = clock()
+            keep = predicate(item)
+            stats.busy_seconds += clock() - start
+            if keep:
+                stats.items += 1
+                yield item
+
+    @staticmethod
+    def _count(iterator, stats):
+        for item in iterator:
+            stats.items += 1
+            yield item
+
+    @staticmethod
+    def _parallel(iterator, runner, func, stats, workers, executor, ordered, max_in_flight, count_items=True):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor {executor!r}, expected 'thread' or 'process'.")
+        # Only parallel stages pay for importing concurrent.futures
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        max_in_flight = max_in_flight or 2 * workers
+        with pool_class(max_workers=workers) as pool:
+            pending = deque()
+            exhausted = False
+            while True:
+                # Top up to max_in_flight: this is where upstream gets pulled
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append(pool.submit(runner, func, item))
+                if not pending:
+                    return
+                stats.sample_depth(len(pending))
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+                result, elapsed = future.result()
+                stats.busy_seconds += elapsed
+                if count_items:
+                    stats.items += 1
+                yield result
+
+    def metrics(self):
+        """Per-stage summaries, in pipeline order."""
+        return {stats.name: stats.summary() for stats in self.stats}
+
+    def bottleneck(self):
+        """The stage that spent the most time working."""
+        return max(self.stats, key=lambda stats: stats.busy_seconds).name
+
+
+def slow_square(x):
+    """Pretend each item needs a 1 ms call to another service."""
+    time.sleep(0.001)
+    return x * x
+
+
+if __name__ == '__main__':
+    for workers in (0, 8):
+        pipeline = (Pipeline(my_range_generator(1, 201))
+                    .map(slow_square, workers=workers)
+                    .filter(lambda x: x % 3 == 0)
+                    .window(3, step=3)
+                    .batch(10))
+        start = time.perf_counter()
+        batches = list(pipeline)
+        print(f"workers={workers}: {sum(len(b) for b in batches)} windows in {time.perf_counter() - start:.2f} secs, "
+              f"bottleneck: {pipeline.bottleneck()}")
+    for stage, summary in pipeline.metrics().items():
+        print(f"  {stage:<22} items={summary['items']:<5} busy={summary['busy_seconds']:.3f}s "
+              f"max queue={summary['max_queue_depth']}")
+
 '''
 Key Takeaways:
 
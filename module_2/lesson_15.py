@@ -39,5 +39,6 @@ def my_context_manager():
         # Teardown code runs here
         print("Tearing down resource...")
 
-with my_context_manager() as res:
-    print(f"Working with {res}")
\ No newline at end of file
+if __name__ == '__main__':
+    with my_context_manager() as res:
+        print(f"Working with {res}")
\ No newline at end of file